@@ -271,8 +271,7 @@ CREATE INDEX IF NOT EXISTS idx_outlook_snapshot_parent ON outlook_snapshot(paren
 CREATE INDEX IF NOT EXISTS idx_outlook_snapshot_path ON outlook_snapshot(path);
 CREATE INDEX IF NOT EXISTS idx_outlook_snapshot_time ON outlook_snapshot(snapshot_time);
 CREATE INDEX IF NOT EXISTS idx_mail_items_store ON mail_items(store_id);
-CREATE INDEX IF NOT EXISTS idx_mail_items_folder ON mail_items(folder_id);
-CREATE INDEX IF NOT EXISTS idx_mail_items_thread ON mail_items(thread_id);
+CREATE INDEX IF NOT EXISTS idx_mail_items_folder_sent ON mail_items(folder_id, sent_time);
 CREATE INDEX IF NOT EXISTS idx_mail_items_thread ON mail_items(thread_id);
 CREATE INDEX IF NOT EXISTS idx_mail_items_parent ON mail_items(parent_entry_id);
 CREATE INDEX IF NOT EXISTS idx_mail_items_sent_time ON mail_items(sent_time);
@@ -281,7 +280,8 @@ CREATE INDEX IF NOT EXISTS idx_mail_items_subject ON mail_items(subject);
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_participants_user ON participants(user_id);
 CREATE INDEX IF NOT EXISTS idx_attachments_mail ON attachments(mail_id);
-CREATE INDEX IF NOT EXISTS idx_mail_tasks_task_id ON mail_tasks(task_id);
+-- task_idとstatusの複合インデックス（進捗トリガーの状態別件数をインデックスのみで数える）
+CREATE INDEX IF NOT EXISTS idx_mail_tasks_task_status ON mail_tasks(task_id, status);
 CREATE INDEX IF NOT EXISTS idx_mail_tasks_status ON mail_tasks(status);
 CREATE INDEX IF NOT EXISTS idx_mail_tasks_message_id ON mail_tasks(message_id);
 CREATE INDEX IF NOT EXISTS idx_mail_tasks_mail_fetch ON mail_tasks(mail_fetch_status);
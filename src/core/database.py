@@ -1,10 +1,59 @@
+import functools
 import os
 import sqlite3
 import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from src.core.logger import get_logger
 
+# 接続ごとに適用するPRAGMA（journal_modeはDBファイルに永続化、それ以外は接続単位）
+# 1回のexecutescriptでまとめて適用する
+_CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-20000;
+PRAGMA mmap_size=268435456;
+"""
+
+# 接続ごとにキャッシュする準備済みステートメント数（既定値は128）
+_CACHED_STATEMENTS = 256
+
+# get_dbで共有するDatabaseManagerの上限数
+_DB_POOL_MAX_SIZE = 16
+
+
+@functools.lru_cache(maxsize=None)
+def _load_sql_statements(script_file: str) -> Tuple[str, ...]:
+    """
+    SQLスクリプトファイルを読み込み、文単位に分割する（実行中は不変のため一度だけ行う）
+
+    トリガー本体（BEGIN...END）内のセミコロンで分割しないよう、
+    sqlite3.complete_statementで文の終わりを判定する
+
+    Args:
+        script_file: SQLスクリプトファイルのパス
+
+    Returns:
+        Tuple[str, ...]: SQL文のタプル
+    """
+    with open(script_file, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines(keepends=True)
+
+    statements = []
+    buffer = ""
+    for line in lines:
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+
+    # 末尾のコメントなど文として完結しない残りは、空でなければそのまま実行してエラーにする
+    if buffer.strip():
+        statements.append(buffer.strip())
+    return tuple(statements)
+
 
 class DatabaseManager:
     """SQLiteデータベースとの接続や操作を担うクラス"""
@@ -18,30 +67,79 @@ class DatabaseManager:
         """
         self.db_path = db_path
         self._local = threading.local()
+        # 全スレッドの接続（close_allでまとめて閉じるため）
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+        # close_allのたびに進める世代（他スレッドの接続が閉じられたことを検出するため）
+        self._generation = 0
         self.logger = get_logger()
         self._initialize_db()
 
+    def _has_open_connection(self) -> bool:
+        """このスレッドの接続が開いていて、close_allで閉じられていないかどうか"""
+        return (
+            hasattr(self._local, "connection")
+            and self._local.generation == self._generation
+        )
+
     def _get_connection(self) -> sqlite3.Connection:
-        """スレッドローカルなデータベース接続を取得する"""
-        if not hasattr(self._local, "connection"):
-            self._local.connection = sqlite3.connect(self.db_path)
-            self._local.connection.row_factory = sqlite3.Row
-            self._local.cursor = self._local.connection.cursor()
+        """
+        スレッドローカルなデータベース接続を取得する
+
+        close_allで閉じられた接続は使わず、新しく接続し直す
+        （明示的なトランザクション中に閉じられた場合は、書き込みが失われているためエラーにする）
+        """
+        if not self._has_open_connection():
+            # rollback/commitでトランザクションを終えるまでは接続し直さない
+            if hasattr(self._local, "connection") and self._in_explicit_transaction():
+                raise sqlite3.ProgrammingError(
+                    f"トランザクション中に接続が閉じられました: {self.db_path}"
+                )
+            # 接続は各スレッドで個別に使うが、close_allで他スレッドから閉じられるようにする
+            connection = sqlite3.connect(
+                self.db_path,
+                cached_statements=_CACHED_STATEMENTS,
+                check_same_thread=False,
+            )
+            connection.row_factory = sqlite3.Row
+            connection.executescript(_CONNECTION_PRAGMAS)
+            with self._connections_lock:
+                self._connections.add(connection)
+                self._local.generation = self._generation
+            self._local.connection = connection
+            self._local.in_transaction = False
+            self._local.cursor = connection.cursor()
+            # 行をタプルのまま返すカーソル（execute_query_tuples用）
+            self._local.tuple_cursor = connection.cursor()
+            self._local.tuple_cursor.row_factory = None
         return self._local.connection
 
     def _get_cursor(self) -> sqlite3.Cursor:
         """スレッドローカルなカーソルを取得する"""
-        if not hasattr(self._local, "cursor"):
-            self._get_connection()
+        self._get_connection()
         return self._local.cursor
 
+    def _in_explicit_transaction(self) -> bool:
+        """begin_transaction等で開始した明示的なトランザクション中かどうか"""
+        return getattr(self._local, "in_transaction", False)
+
+    def _auto_commit(self) -> None:
+        """明示的なトランザクション外の場合のみコミットする"""
+        if not self._in_explicit_transaction():
+            self._get_connection().commit()
+
+    def _auto_rollback(self) -> None:
+        """明示的なトランザクション外の場合のみロールバックする（トランザクション中は呼び出し元に委ねる）"""
+        if not self._in_explicit_transaction():
+            self._get_connection().rollback()
+
     def _initialize_db(self) -> None:
         """データベースの初期化を行う"""
         try:
             # データベースディレクトリが存在しない場合は作成
             db_dir = os.path.dirname(self.db_path)
-            if not os.path.exists(db_dir):
-                os.makedirs(db_dir)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
 
             # 初期接続を作成
             self._get_connection()
@@ -74,12 +172,16 @@ class DatabaseManager:
 
         for script_file in script_files:
             try:
-                with open(script_file, "r", encoding="utf-8") as f:
-                    sql_script = f.read()
-                    self._get_cursor().executescript(sql_script)
-                self._get_connection().commit()
+                # 分割済みの文を1つのトランザクションで適用する（文ごとのコミットを避ける）
+                # 同じ文字列を実行するため、接続のステートメントキャッシュも効く
+                cursor = self._get_cursor()
+                cursor.execute("BEGIN")
+                for statement in _load_sql_statements(script_file):
+                    cursor.execute(statement)
+                cursor.execute("COMMIT")
                 self.logger.info(f"SQLスクリプト実行完了: {script_file}")
             except Exception as e:
+                self._get_connection().rollback()
                 self.logger.error(f"SQLスクリプト実行エラー ({script_file}): {str(e)}")
                 raise
 
@@ -106,9 +208,36 @@ class DatabaseManager:
         """
         try:
             if hasattr(self._local, "connection"):
+                with self._connections_lock:
+                    self._connections.discard(self._local.connection)
                 self._local.connection.close()
                 del self._local.connection
                 del self._local.cursor
+                del self._local.tuple_cursor
+            self._local.in_transaction = False
+            return True
+        except Exception as e:
+            self.logger.error(f"データベース切断エラー: {e}")
+            return False
+
+    def close_all(self) -> bool:
+        """
+        全スレッドで開かれているデータベース接続を閉じる
+
+        他スレッドの接続も閉じる。閉じられたスレッドが以後このインスタンスを使うと、
+        新しく接続し直す（明示的なトランザクション中だった場合はエラーになる）
+
+        Returns:
+            bool: 切断に成功したかどうか
+        """
+        try:
+            self.disconnect()
+            with self._connections_lock:
+                connections = list(self._connections)
+                self._connections.clear()
+                self._generation += 1
+            for connection in connections:
+                connection.close()
             return True
         except Exception as e:
             self.logger.error(f"データベース切断エラー: {e}")
@@ -136,6 +265,30 @@ class DatabaseManager:
             )
             return []  # エラー時に空のリストを返す
 
+    def execute_query_tuples(self, query: str, params: tuple = ()) -> List[Tuple]:
+        """
+        SELECT クエリを実行し、結果をタプルのリストとして返す
+
+        行ごとの辞書変換を行わないため、列を位置で扱う場合はexecute_queryより軽い
+
+        Args:
+            query: 実行するSQLクエリ
+            params: クエリパラメータ
+
+        Returns:
+            クエリ結果のタプルリスト
+        """
+        try:
+            self.connect()
+            cursor = self._local.tuple_cursor
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        except Exception as e:
+            self.logger.error(
+                f"クエリ実行エラー: {query}, パラメータ: {params}, エラー: {str(e)}"
+            )
+            return []  # エラー時に空のリストを返す
+
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """
         INSERT, UPDATE, DELETE クエリを実行し、影響を受けた行数を返す
@@ -150,10 +303,10 @@ class DatabaseManager:
         try:
             self.connect()
             self._get_cursor().execute(query, params)
-            self._get_connection().commit()
+            self._auto_commit()
             return self._get_cursor().rowcount
         except Exception as e:
-            self._get_connection().rollback()
+            self._auto_rollback()
             self.logger.error(
                 f"更新クエリ実行エラー: {query}, パラメータ: {params}, エラー: {str(e)}"
             )
@@ -173,10 +326,10 @@ class DatabaseManager:
         try:
             self.connect()
             self._get_cursor().executemany(query, params_list)
-            self._get_connection().commit()
+            self._auto_commit()
             return self._get_cursor().rowcount
         except Exception as e:
-            self._get_connection().rollback()
+            self._auto_rollback()
             self.logger.error(
                 f"一括クエリ実行エラー: {query}, パラメータ数: {len(params_list)}, エラー: {str(e)}"
             )
@@ -196,10 +349,10 @@ class DatabaseManager:
         try:
             self.connect()
             self._get_cursor().execute(query, params)
-            self._get_connection().commit()
+            self._auto_commit()
             return self._get_cursor().lastrowid
         except Exception as e:
-            self._get_connection().rollback()
+            self._auto_rollback()
             self.logger.error(
                 f"挿入クエリ実行エラー: {query}, パラメータ: {params}, エラー: {str(e)}"
             )
@@ -227,21 +380,46 @@ class DatabaseManager:
             )
             raise
 
-    def begin_transaction(self) -> bool:
+    def _begin(self, statement: str) -> bool:
         """
         トランザクションを開始する
 
+        明示的なトランザクション中はexecute_update等が個別にコミットしないため、
+        commit()までの書き込みが1回のコミットにまとめられる
+
+        Args:
+            statement: 実行するBEGIN文
+
         Returns:
             bool: トランザクション開始に成功したかどうか
         """
         try:
             self.connect()
-            self._get_connection().execute("BEGIN TRANSACTION")
+            self._get_connection().execute(statement)
+            self._local.in_transaction = True
             return True
         except Exception as e:
             self.logger.error(f"トランザクション開始エラー: {e}")
             return False
 
+    def begin_transaction(self) -> bool:
+        """
+        トランザクションを開始する
+
+        Returns:
+            bool: トランザクション開始に成功したかどうか
+        """
+        return self._begin("BEGIN TRANSACTION")
+
+    def begin_immediate(self) -> bool:
+        """
+        書き込みロックを取得してトランザクションを開始する（BEGIN IMMEDIATE）
+
+        Returns:
+            bool: トランザクション開始に成功したかどうか
+        """
+        return self._begin("BEGIN IMMEDIATE")
+
     def commit(self) -> bool:
         """
         トランザクションをコミットする
@@ -250,8 +428,16 @@ class DatabaseManager:
             bool: コミットに成功したかどうか
         """
         try:
-            if hasattr(self._local, "connection"):
-                self._get_connection().commit()
+            if self._has_open_connection():
+                self._local.connection.commit()
+            elif self._in_explicit_transaction():
+                # 他スレッドのclose_allで接続が閉じられ、書き込みは確定していない
+                self._local.in_transaction = False
+                self.logger.error(
+                    "コミットエラー: トランザクション中に接続が閉じられました"
+                )
+                return False
+            self._local.in_transaction = False
             return True
         except Exception as e:
             self.logger.error(f"コミットエラー: {e}")
@@ -265,8 +451,9 @@ class DatabaseManager:
             bool: ロールバックに成功したかどうか
         """
         try:
-            if hasattr(self._local, "connection"):
-                self._get_connection().rollback()
+            if self._has_open_connection():
+                self._local.connection.rollback()
+            self._local.in_transaction = False
             return True
         except Exception as e:
             self.logger.error(f"ロールバックエラー: {e}")
@@ -312,8 +499,8 @@ class DatabaseManager:
         try:
             # バックアップディレクトリが存在しない場合は作成
             backup_dir = os.path.dirname(backup_path)
-            if not os.path.exists(backup_dir):
-                os.makedirs(backup_dir)
+            if backup_dir:
+                os.makedirs(backup_dir, exist_ok=True)
 
             # 現在の接続を閉じる
             self.disconnect()
@@ -340,3 +527,72 @@ class DatabaseManager:
             except:
                 pass
             return False
+
+
+# パスごとに共有するDatabaseManager（スキーマ初期化をパスごとに一度で済ませる）
+_DB_POOL: "OrderedDict[str, DatabaseManager]" = OrderedDict()
+# 上限超過でプールから外したが、他スレッドの接続が残っているDatabaseManager
+# （release_dbでまとめて閉じられるよう、パスごとに保持する）
+_DB_RETIRED: Dict[str, List[DatabaseManager]] = {}
+_DB_POOL_LOCK = threading.Lock()
+
+
+def get_db(db_path: str) -> DatabaseManager:
+    """
+    パスごとに共有されるDatabaseManagerを取得する
+
+    初回のみDatabaseManagerを生成し、以降は同じインスタンスを返す。
+    ファイルを削除する場合は、先にrelease_dbで解放すること（取得のたびに
+    ファイルの存在は確認しない）。
+    上限を超えた場合は最も使われていないものをプールから外し、呼び出し元スレッドの
+    接続のみを切断する。他スレッドの接続が残っている場合は、取得済みのインスタンスを
+    使い続けている呼び出し元がいる可能性があるため閉じずに保持し、release_dbで閉じる。
+
+    Args:
+        db_path: データベースファイルのパス
+
+    Returns:
+        DatabaseManager: 共有のDatabaseManager
+    """
+    key = os.path.abspath(db_path)
+    with _DB_POOL_LOCK:
+        db = _DB_POOL.get(key)
+        if db is not None:
+            _DB_POOL.move_to_end(key)
+            return db
+
+        db = DatabaseManager(db_path)
+        _DB_POOL[key] = db
+        while len(_DB_POOL) > _DB_POOL_MAX_SIZE:
+            evicted_key, evicted = _DB_POOL.popitem(last=False)
+            evicted.disconnect()
+            if evicted._connections:
+                _DB_RETIRED.setdefault(evicted_key, []).append(evicted)
+
+        # 接続がすべて閉じられたものは保持し続けない
+        for retired_key in list(_DB_RETIRED):
+            retired = [m for m in _DB_RETIRED[retired_key] if m._connections]
+            if retired:
+                _DB_RETIRED[retired_key] = retired
+            else:
+                del _DB_RETIRED[retired_key]
+        return db
+
+
+def release_db(db_path: str) -> None:
+    """
+    共有のDatabaseManagerを全スレッドの接続ごと切断してプールから取り除く
+
+    上限超過でプールから外したDatabaseManagerに残っている接続も閉じる
+
+    Args:
+        db_path: データベースファイルのパス
+    """
+    key = os.path.abspath(db_path)
+    with _DB_POOL_LOCK:
+        managers = _DB_RETIRED.pop(key, [])
+        db = _DB_POOL.pop(key, None)
+    if db is not None:
+        managers.append(db)
+    for manager in managers:
+        manager.close_all()
@@ -180,6 +180,10 @@ class Applogger:
         try:
             log_level = getattr(logging, level.upper(), logging.INFO)
 
+            # 出力されないレベルの場合は呼び出し元の探索やJSON化を行わない
+            if not self.logger.isEnabledFor(log_level):
+                return
+
             caller_info = self._get_caller_info()
 
             # メッセージの無効なUnicode文字を処理
@@ -232,6 +236,10 @@ class Applogger:
             # 再帰を避けるため、標準出力のみに出力
             print(f"ログ記録に失敗しました: {e}")
 
+    def isEnabledFor(self, level: int) -> bool:
+        """指定したレベルのログが出力されるかどうかを返す（標準ロガー互換）"""
+        return self.logger.isEnabledFor(level)
+
     def debug(self, message: str, **kwargs) -> None:
         """デバッグレベルのログを記録する"""
         self.log(message, "DEBUG", **kwargs)
@@ -58,10 +58,13 @@ class ModelMetrics:
     async def add_request(self, token_cost: int) -> None:
         """
         リクエスト開始時にRPMとTPMを更新
+        - 判定後に他のリクエストがTPMを使った場合は、空くまで待機する
+        - 待機がタイムアウトした場合はTimeoutErrorを送出する
         """
         async with self.lock:
             self.rpm_counter += 1
-            await self.tpm_limiter.on_token_added(token_cost)
+        # 待機中もcomplete_requestがロックを取得できるよう、ロックの外で待つ
+        await self.tpm_limiter.wait_for_tokens(token_cost)
 
     async def complete_request(self, latency: float, token_cost: int) -> None:
         """
@@ -1,10 +1,7 @@
 import asyncio
-from asyncio import Lock  # 非同期
 from collections import deque
 from datetime import datetime
-
-# from threading import Lock # 同期
-from typing import Deque, Final, Optional, Protocol, Set, Tuple
+from typing import Deque, Optional, Protocol, Set, Tuple
 
 from src.core.logger import get_logger
 from src.models.azure.ai_config_loader import AIConfigLoader
@@ -28,7 +25,6 @@ class TokenSubject:
 
     def __init__(self) -> None:
         self._observers: Set[TokenObserver] = set()
-        self._lock = Lock()
         self.logger = get_logger()
 
     def attach(self, observer: TokenObserver) -> None:
@@ -38,6 +34,8 @@ class TokenSubject:
         self._observers.remove(observer)
 
     async def notify_token_completed(self, token_count: int) -> None:
+        if not self._observers:
+            return
         for observer in self._observers:
             try:
                 await observer.on_token_completed(token_count)
@@ -45,6 +43,8 @@ class TokenSubject:
                 self.logger.error(f"エラーが発生しました: {e}")
 
     async def notify_token_added(self, token_count: int) -> None:
+        if not self._observers:
+            return
         for observer in self._observers:
             try:
                 await observer.on_token_added(token_count)
@@ -59,12 +59,17 @@ class TokenRateLimiter(TokenObserver):
         config = AIConfigLoader()
         self.max_tpm = max_tpm
         self.window_size = 60
-        self.token_history: Deque[Tuple[datetime, int]] = deque()
-        self.lock = Lock()
+        self.cleanup_threshold = 100
+        # 古いエントリは上限到達時に自動で破棄される
+        self.token_history: Deque[Tuple[datetime, int]] = deque(maxlen=10_000)
+        self._tpm_total = 0
+        self.lock = asyncio.Lock()
         self.active_tokens = 0
-        self.waiting_tokens: Deque[Tuple[int, asyncio.Event, datetime]] = deque()
+        self.waiting_tokens: Deque[Tuple[int, asyncio.Future]] = deque()
+        # 時間経過による再判定の予約（待機者がいる間のみ）
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
+        self._wake_task: Optional[asyncio.Task] = None
         self.timeout = config.token_timeout  # 設定ファイルから取得
-        self.cleanup_threshold = 100
         self.logger = get_logger()
 
     async def on_token_completed(self, token_count: int) -> None:
@@ -74,20 +79,91 @@ class TokenRateLimiter(TokenObserver):
 
     async def on_token_added(self, token_count: int) -> None:
         async with self.lock:
-            self.active_tokens += token_count
-            current_time = datetime.now()
-            self.token_history.append((current_time, token_count))
+            self._add_tokens(token_count, datetime.now())
+
+    def _add_tokens(self, token_count: int, current_time: datetime) -> None:
+        """ロック取得済みの状態でトークンの使用を記録する"""
+        self.active_tokens += token_count
+        # maxlen到達時に押し出されるエントリ分を合計から差し引く
+        if len(self.token_history) == self.token_history.maxlen:
+            self._tpm_total -= self.token_history[0][1]
+        self.token_history.append((current_time, token_count))
+        self._tpm_total += token_count
+        if len(self.token_history) >= self.cleanup_threshold:
             self._cleanup_history(current_time)
 
     async def _process_waiting_tokens(self) -> None:
         while self.waiting_tokens:
-            token_count, event, timestamp = self.waiting_tokens[0]
-            if await self._can_process_tokens(token_count):
+            token_count, future = self.waiting_tokens[0]
+            # キャンセル済み・タイムアウト済みの待機者は読み飛ばす
+            if future.done():
                 self.waiting_tokens.popleft()
-                self.active_tokens += token_count
-                event.set()
-            else:
+                continue
+            if not self._can_process_tokens(token_count):
                 break
+            self.waiting_tokens.popleft()
+            # 受け付けた分をその場で記録し、同じ走査で上限を超えて受け付けないようにする
+            self._add_tokens(token_count, datetime.now())
+            future.set_result(None)
+        self._schedule_wake_up()
+
+    def _schedule_wake_up(self) -> None:
+        """
+        待機者が残っている場合、最も古い履歴がウィンドウ外になる時刻に再判定を予約する
+
+        トークン完了の通知がなくても、時間経過でTPMが空いた時点で待機者を受け付ける
+        """
+        if self._wake_handle is not None:
+            self._wake_handle.cancel()
+            self._wake_handle = None
+        if not self.waiting_tokens or not self.token_history:
+            return
+
+        elapsed = (datetime.now() - self.token_history[0][0]).total_seconds()
+        delay = max(self.window_size - elapsed, 0)
+        self._wake_handle = asyncio.get_running_loop().call_later(
+            delay, self._on_wake_up
+        )
+
+    def _on_wake_up(self) -> None:
+        self._wake_handle = None
+        self._wake_task = asyncio.ensure_future(self._wake_waiting_tokens())
+
+    async def _wake_waiting_tokens(self) -> None:
+        async with self.lock:
+            await self._process_waiting_tokens()
+
+    def _can_process_tokens(self, token_count: int) -> bool:
+        """ロック取得済みの状態で処理可否を判定する"""
+        self._cleanup_history(datetime.now())
+        return self._tpm_total + token_count <= self.max_tpm
+
+    async def wait_for_tokens(self, token_count: int) -> None:
+        """
+        トークンが処理可能になるまで待機し、受け付けた分を使用中として記録する
+
+        on_token_addedの代わりに呼び出す（受け付け時に記録済みのため重ねて呼ばないこと）
+
+        Raises:
+            TimeoutError: 待機がタイムアウトした場合
+        """
+        async with self.lock:
+            # 先に並んでいる待機者を受け付け、タイムアウト済みの待機者を取り除く
+            await self._process_waiting_tokens()
+            if not self.waiting_tokens and self._can_process_tokens(token_count):
+                self._add_tokens(token_count, datetime.now())
+                return
+            future = asyncio.get_running_loop().create_future()
+            self.waiting_tokens.append((token_count, future))
+            self._schedule_wake_up()
+
+        try:
+            await asyncio.wait_for(future, self.timeout)
+        except TimeoutError:
+            # キャンセルされた自分の後ろの待機者が受け付けられるよう待機列を進める
+            async with self.lock:
+                await self._process_waiting_tokens()
+            raise
 
     async def can_process_tokens(self, token_count: int) -> bool:
         current_tpm = await self.get_current_tpm()
@@ -97,7 +173,7 @@ class TokenRateLimiter(TokenObserver):
         current_time = datetime.now()
         async with self.lock:
             self._cleanup_history(current_time)
-            return sum(tokens for _, tokens in self.token_history)
+            return self._tpm_total
 
     def _cleanup_history(self, current_time: datetime) -> None:
         while (
@@ -105,13 +181,5 @@ class TokenRateLimiter(TokenObserver):
             and (current_time - self.token_history[0][0]).total_seconds()
             >= self.window_size
         ):
-            self.token_history.popleft()
-
-    async def _cleanup_waiting_tokens(self) -> None:
-        current_time = datetime.now()
-        async with self.lock:
-            self.waiting_tokens = deque(
-                (token_count, event, timestamp)
-                for token_count, event, timestamp in self.waiting_tokens
-                if (current_time - timestamp).total_seconds() < self.timeout
-            )
+            _, tokens = self.token_history.popleft()
+            self._tpm_total -= tokens
@@ -1,12 +1,141 @@
+import asyncio
+import functools
+import gc
+import logging
 import os
+import re
 import shutil
+import stat
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple
 
-from src.core.database import DatabaseManager
+from src.core.database import DatabaseManager, get_db, release_db
 from src.core.logger import get_logger
-from src.models.outlook.outlook_extraction_service import OutlookExtractionService
-from src.util.object_util import get_safe
+
+# プロジェクトのルートディレクトリとデフォルトのデータベースパス
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_DEFAULT_DB = os.path.join(_ROOT, "data", "tasks.db")
+_TASKS_ROOT = os.path.join(_ROOT, "data", "tasks")
+_TASKS_ROOT_SEP = _TASKS_ROOT + os.sep
+_TASK_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+# 削除時にタスクフォルダを退避する名前の目印（<タスクフォルダ>.trash.<uuid>）
+_TRASH_MARKER = ".trash."
+
+# このプロセスで退避フォルダの掃除を開始済みかどうか（モデル生成ごとに繰り返さない）
+_trash_sweep_started = False
+
+# items.dbの存在確認結果を再利用する秒数と、そのキャッシュ（タスクID -> (存在, 確認時刻)）
+_ITEMS_DB_EXISTS_TTL = 1.0
+_items_db_exists_cache: Dict[str, Tuple[bool, float]] = {}
+
+# 添付ファイルのロック解除を並列に行うスレッド数
+_UNLOCK_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+_SQL_GET_TASKS = "SELECT id, from_folder_name FROM task_info"
+_SQL_DELETE_TASK = "DELETE FROM task_info WHERE id = ?"
+# 行の有無のみを確認するため、COUNT(*)ではなく最初の1行で止まるEXISTSを使う
+# task_progressはtask_idが主キーのため、状態の取得は主キー検索になる（並べ替え不要）
+_SQL_CHECK_TASK_STATE = """
+SELECT
+    EXISTS (SELECT 1 FROM outlook_snapshot),
+    EXISTS (SELECT 1 FROM mail_tasks WHERE task_id = ?),
+    (SELECT status FROM task_progress WHERE task_id = ?)
+"""
+
+
+@functools.lru_cache(maxsize=256)
+def _task_paths(task_id: str) -> Tuple[str, str, str]:
+    """
+    タスクに関連するパスを取得する
+
+    Args:
+        task_id: タスクID
+
+    Returns:
+        Tuple[str, str, str]: (タスクフォルダ, items.db, 添付ファイルフォルダ)のパス
+
+    Raises:
+        ValueError: タスクIDに使用できない文字が含まれる場合
+    """
+    task_id = str(task_id)
+    # パスの区切りや".."を含むIDでタスクフォルダ外を指さないよう検証する
+    if not _TASK_ID_PATTERN.fullmatch(task_id):
+        raise ValueError(f"不正なタスクID: {task_id}")
+
+    # 検証済みのIDのみを連結するため、os.path.joinを使わずに組み立てる
+    task_dir = f"{_TASKS_ROOT_SEP}{task_id}"
+    return (
+        task_dir,
+        f"{task_dir}{os.sep}items.db",
+        f"{task_dir}{os.sep}attachments",
+    )
+
+
+def _items_db_exists(task_id: str) -> bool:
+    """
+    items.dbの存在を確認する（状態の再確認が続く場合に備え、短時間は結果を再利用する）
+
+    Args:
+        task_id: タスクID
+
+    Returns:
+        bool: items.dbが存在するかどうか
+    """
+    now = time.monotonic()
+    cached = _items_db_exists_cache.get(task_id)
+    if cached is not None and now - cached[1] < _ITEMS_DB_EXISTS_TTL:
+        return cached[0]
+
+    exists = os.path.isfile(_task_paths(task_id)[1])
+    _items_db_exists_cache[task_id] = (exists, now)
+    return exists
+
+
+def _invalidate_items_db_exists(task_id: str) -> None:
+    """
+    items.dbの存在確認のキャッシュを破棄する（作成・削除時に呼び出す）
+
+    Args:
+        task_id: タスクID
+    """
+    _items_db_exists_cache.pop(task_id, None)
+
+
+def _iter_files(directory_path: str) -> Iterator[str]:
+    """
+    ディレクトリ配下のファイルパスを再帰的に列挙する
+
+    os.scandirのDirEntryが保持する種別情報を使い、エントリごとのstatを避ける
+
+    Args:
+        directory_path: ディレクトリのパス
+
+    Yields:
+        str: ファイルのパス
+    """
+    with os.scandir(directory_path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry.path
+
+
+def _force_remove(func, path: str, exc: BaseException) -> None:
+    """
+    shutil.rmtreeのonexcハンドラ: 読み取り専用属性を外して削除を再試行する
+
+    Args:
+        func: 失敗した削除関数（os.unlink、os.rmdirなど）
+        path: 削除に失敗したパス
+        exc: 発生した例外
+    """
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
 
 
 class HomeContentModel:
@@ -22,11 +151,7 @@ class HomeContentModel:
         # デフォルトのデータベースパスを設定
         if db_path is None:
             # プロジェクトのルートディレクトリを基準にデータベースパスを設定
-            db_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                "data",
-                "tasks.db",
-            )
+            db_path = _DEFAULT_DB
             self.logger.debug(
                 "HomeContentModel: デフォルトデータベースパス設定", db_path=db_path
             )
@@ -36,6 +161,14 @@ class HomeContentModel:
             )
 
         self.db_manager = DatabaseManager(db_path)
+        # このセッションで作成済みのタスクID（同じタスクの作成処理を繰り返さないため）
+        self._created_tasks = set()
+
+        # 前回の終了時などに削除しきれなかった退避フォルダをバックグラウンドで掃除する
+        global _trash_sweep_started
+        if not _trash_sweep_started:
+            _trash_sweep_started = True
+            threading.Thread(target=self._sweep_trash_directories, daemon=True).start()
         self.logger.info("HomeContentModel: 初期化完了", db_path=db_path)
 
     def create_task_directory_and_database(self, task_id: str) -> bool:
@@ -48,55 +181,35 @@ class HomeContentModel:
         Returns:
             bool: 作成が成功したかどうか
         """
-        try:
-            # タスクフォルダのパスを設定
-            task_dir = os.path.join("data", "tasks", str(task_id))
+        # 作成済みの場合はファイルシステムを確認しない
+        if task_id in self._created_tasks:
+            return True
 
-            # フォルダが存在しない場合のみ作成
-            if not os.path.exists(task_dir):
-                os.makedirs(task_dir)
-                self.logger.info(
-                    f"HomeContentModel: タスクフォルダを作成しました - {task_dir}"
-                )
+        try:
+            # タスクフォルダとitems.dbのパスを設定
+            task_dir, items_db_path, _ = _task_paths(task_id)
 
-            # items.dbのパスを設定
-            items_db_path = os.path.join(task_dir, "items.db")
+            # フォルダを作成（既に存在する場合はそのまま使用）
+            os.makedirs(task_dir, exist_ok=True)
 
             # items.dbが存在しない場合のみ作成
-            if not os.path.exists(items_db_path):
-                # データベースを作成
-                db_manager = DatabaseManager(items_db_path)
-
-                # 外部キー制約を一時的に無効化
-                db_manager.execute_update("PRAGMA foreign_keys = OFF")
-
-                # items.sqlの内容を読み込んで実行
-                sql_path = os.path.join(
-                    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                    "data",
-                    "items.sql",
-                )
-                with open(sql_path, "r", encoding="utf-8") as f:
-                    sql_script = f.read()
-
-                # SQLスクリプトを実行
-                db_manager.execute_script(sql_script)
-                db_manager.commit()
-
-                # 外部キー制約を再度有効化
-                db_manager.execute_update("PRAGMA foreign_keys = ON")
-                db_manager.commit()
-
-                db_manager.disconnect()
+            if not os.path.isfile(items_db_path):
+                # データベースを作成（items.sqlのスキーマはDatabaseManagerの初期化時に適用される）
+                # 作成した接続はそのまま共有して以降の確認処理で再利用する
+                get_db(items_db_path)
+                _invalidate_items_db_exists(task_id)
 
                 self.logger.info(
-                    f"HomeContentModel: items.dbを作成し、スキーマを適用しました - {items_db_path}"
+                    "HomeContentModel: items.dbを作成し、スキーマを適用しました",
+                    items_db_path=items_db_path,
                 )
 
+            self._created_tasks.add(task_id)
             return True
         except Exception as e:
             self.logger.error(
-                f"HomeContentModel: タスクフォルダまたはデータベースの作成に失敗しました - {e}"
+                "HomeContentModel: タスクフォルダまたはデータベースの作成に失敗しました",
+                error=str(e),
             )
             return False
 
@@ -108,16 +221,11 @@ class HomeContentModel:
             List[Tuple[int, str]]: (id, from_folder_name)のリスト
         """
         try:
-            self.logger.debug("HomeContentModel: タスクデータ取得開始")
-            # DatabaseManagerを使用してクエリを実行
-            query = "SELECT id, from_folder_name FROM task_info"
-            results = self.db_manager.execute_query(query)
-
-            # 辞書のリストをタプルのリストに変換
-            task_data = [
-                (get_safe(item, "id"), get_safe(item, "from_folder_name"))
-                for item in results
-            ]
+            # 頻繁に呼ばれるため、DEBUGが無効な場合はログ呼び出し自体を省く
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("HomeContentModel: タスクデータ取得開始")
+            # (id, from_folder_name)のタプルとしてそのまま取得
+            task_data = self.db_manager.execute_query_tuples(_SQL_GET_TASKS)
             self.logger.info(
                 "HomeContentModel: タスクデータ取得成功", task_count=len(task_data)
             )
@@ -136,156 +244,178 @@ class HomeContentModel:
         Returns:
             bool: 削除が成功したかどうか
         """
+        return self.delete_tasks([task_id]).get(task_id, False)
+
+    def delete_tasks(self, task_ids: List[str]) -> Dict[str, bool]:
+        """
+        指定されたIDのタスクをまとめて削除する
+
+        タスクフォルダの削除は並列に行い、フォルダを削除できたタスクのみ
+        1つのトランザクションでtasks.dbから削除する
+
+        Args:
+            task_ids: 削除するタスクIDのリスト
+
+        Returns:
+            Dict[str, bool]: タスクIDごとの削除結果
+        """
+        results = {task_id: False for task_id in task_ids}
+
+        # パスを組み立てられないIDは削除対象から除外する
+        invalid_ids = [
+            task_id
+            for task_id in task_ids
+            if not _TASK_ID_PATTERN.fullmatch(str(task_id))
+        ]
+        if invalid_ids:
+            self.logger.error("不正なタスクIDのため削除しません", task_ids=invalid_ids)
+            task_ids = [task_id for task_id in task_ids if task_id not in invalid_ids]
+        if not task_ids:
+            return results
+
         try:
-            # タスクディレクトリのパスを設定
-            task_dir = os.path.join("data", "tasks", str(task_id))
-            items_db_path = os.path.join(task_dir, "items.db")
+            # PreviewContentが保持しているitems.dbへの参照を解放する
+            if any(os.path.exists(_task_paths(task_id)[0]) for task_id in task_ids):
+                self._release_preview_content(task_ids)
+                # Windowsでは解放したCOM/SQLiteのハンドルが残るとファイルを削除できない
+                if os.name == "nt":
+                    gc.collect()
+
+            # タスクフォルダの削除を並列に実行
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                removed = list(executor.map(self._remove_task_files, task_ids))
+            deleted_ids = [
+                task_id for task_id, ok in zip(task_ids, removed, strict=True) if ok
+            ]
+            # フォルダを削除したタスクは、再作成時に改めて作成処理を行う
+            self._created_tasks.difference_update(deleted_ids)
+            if not deleted_ids:
+                return results
+
+            # フォルダを削除できたタスクのみ、tasks.dbから1回のコミットで削除
+            if not self.db_manager.begin_immediate():
+                return results
+            try:
+                self.db_manager.execute_many(
+                    _SQL_DELETE_TASK, [(task_id,) for task_id in deleted_ids]
+                )
+            except Exception:
+                self.db_manager.rollback()
+                raise
+            # 接続は閉じずに残し、DELETE文を接続のステートメントキャッシュに保持する
+            if not self.db_manager.commit():
+                return results
+
+            for task_id in deleted_ids:
+                results[task_id] = True
+                self.logger.info("タスクを完全に削除しました", task_id=task_id)
+
+            return results
+        except Exception as e:
+            self.logger.error("タスク削除エラー", error=str(e))
+            return results
 
-            # タスクディレクトリが存在しない場合のチェック
-            if not os.path.exists(task_dir):
+    def _release_preview_content(self, task_ids: List[str]) -> None:
+        """
+        PreviewContentが保持しているitems.dbへの参照を解放する
+
+        Args:
+            task_ids: 削除するタスクIDのリスト
+        """
+        try:
+            # 循環参照を避けるためにここでインポート
+            from src.views.contents.content_factory import get_content_by_type
+
+            # 現在のコンテンツからPreviewContentを取得
+            preview_content = get_content_by_type("PreviewContent")
+            # PreviewContentが見つかった場合、リソースを解放
+            if preview_content:
+                if preview_content.release_for_delete():
+                    self.logger.info(
+                        "HomeContentModel: 既存のPreviewContentのViewModelをクローズしました",
+                        task_ids=task_ids,
+                    )
+                else:
+                    self.logger.warning(
+                        "HomeContentModel: PreviewContentのViewModelが見つかりません",
+                        task_ids=task_ids,
+                    )
+            else:
                 self.logger.warning(
-                    f"HomeContentModel: 削除対象のタスクディレクトリが存在しません - {task_dir}"
+                    "HomeContentModel: PreviewContentが見つかりません",
+                    task_ids=task_ids,
                 )
-                # タスクディレクトリがない場合はtask_infoテーブルからのみ削除
-                self.db_manager.execute_update(
-                    "DELETE FROM task_info WHERE id = ?", (task_id,)
+        except Exception as preview_ex:
+            self.logger.warning(
+                "HomeContentModel: PreviewContentのリソース解放中にエラー",
+                error=str(preview_ex),
+            )
+            # エラーが発生してもタスク削除は続行する
+            # フォールバックとして新しいViewModelを作成して閉じる
+            try:
+                from src.viewmodels.preview_content_viewmodel import (
+                    PreviewContentViewModel,
                 )
-                self.db_manager.commit()
-                self.db_manager.disconnect()
-                return True
 
-            # PreviewContentの参照を探して、リソースを解放する
-            try:
-                # 循環参照を避けるためにここでインポート
-                from src.views.contents.content_factory import get_current_contents
-
-                # 現在のコンテンツを取得
-                current_contents = get_current_contents()
-                if current_contents:
-                    # PreviewContentのインスタンスを探す
-                    preview_content = None
-
-                    for content in current_contents:
-                        if (
-                            hasattr(content, "__class__")
-                            and content.__class__.__name__ == "PreviewContent"
-                        ):
-                            preview_content = content
-                            break
-
-                    # PreviewContentが見つかった場合、リソースを解放
-                    if preview_content:
-                        if (
-                            hasattr(preview_content, "viewmodel")
-                            and preview_content.viewmodel
-                        ):
-                            preview_content.viewmodel.close()
-                            preview_content.viewmodel = None
-                            self.logger.info(
-                                f"HomeContentModel: 既存のPreviewContentのViewModelをクローズしました - {task_id}"
-                            )
-
-                            # 会話コンテナのリセット
-                            if hasattr(preview_content, "thread_containers"):
-                                preview_content.thread_containers.clear()
-
-                            # メールリストとメールコンテンツビューアーのリセット
-                            if hasattr(preview_content, "mail_list_component"):
-                                if hasattr(
-                                    preview_content.mail_list_component, "reset"
-                                ):
-                                    preview_content.mail_list_component.reset()
-
-                            if hasattr(preview_content, "mail_content_viewer"):
-                                if hasattr(
-                                    preview_content.mail_content_viewer, "reset"
-                                ):
-                                    preview_content.mail_content_viewer.reset()
-
-                            # タスクIDをクリア
-                            preview_content.task_id = None
-
-                            # 少し待機
-                            time.sleep(1.0)
-                        else:
-                            self.logger.warning(
-                                f"HomeContentModel: PreviewContentのViewModelが見つかりません - {task_id}"
-                            )
-                    else:
-                        self.logger.warning(
-                            f"HomeContentModel: PreviewContentが見つかりません - {task_id}"
+                for task_id in task_ids:
+                    if os.path.isdir(_task_paths(task_id)[0]):
+                        PreviewContentViewModel(task_id).close()
+                        self.logger.info(
+                            "HomeContentModel: フォールバックでPreviewContentViewModelをクローズしました",
+                            task_id=task_id,
                         )
-                else:
-                    self.logger.warning(
-                        f"HomeContentModel: 現在のコンテンツが見つかりません - {task_id}"
-                    )
-            except Exception as preview_ex:
+            except Exception as fallback_ex:
                 self.logger.warning(
-                    f"HomeContentModel: PreviewContentのリソース解放中にエラー - {str(preview_ex)}"
+                    "HomeContentModel: フォールバックリソース解放中にエラー",
+                    error=str(fallback_ex),
                 )
-                # エラーが発生してもタスク削除は続行する
-                # フォールバックとして新しいViewModelを作成して閉じる
-                try:
-                    from src.viewmodels.preview_content_viewmodel import (
-                        PreviewContentViewModel,
-                    )
 
-                    preview_viewmodel = PreviewContentViewModel(task_id)
-                    preview_viewmodel.close()
-                    self.logger.info(
-                        f"HomeContentModel: フォールバックでPreviewContentViewModelをクローズしました - {task_id}"
-                    )
+    def _remove_task_files(self, task_id: str) -> bool:
+        """
+        タスクフォルダ（items.dbと添付ファイル）を削除する
 
-                    # 追加の待機時間
-                    time.sleep(1.0)
-                except Exception as fallback_ex:
-                    self.logger.warning(
-                        f"HomeContentModel: フォールバックリソース解放中にエラー - {str(fallback_ex)}"
-                    )
+        Args:
+            task_id: タスクID
 
-            # ファイルの使用状況を確認 - items.dbが存在する場合
-            if os.path.exists(items_db_path):
-                # リソース解放のための試行を行う
-                self._release_resources(items_db_path)
+        Returns:
+            bool: フォルダが存在しない状態になったかどうか
+        """
+        try:
+            # タスクディレクトリのパスを設定
+            task_dir, items_db_path, attachments_dir = _task_paths(task_id)
 
-            # 添付ファイルやその他のリソースを解放するために再度試行
-            attachments_dir = os.path.join(task_dir, "attachments")
-            if os.path.exists(attachments_dir):
-                self._release_directory_resources(attachments_dir)
+            # タスクディレクトリが存在しない場合はtask_infoテーブルからのみ削除
+            if not os.path.exists(task_dir):
+                self.logger.warning(
+                    "HomeContentModel: 削除対象のタスクディレクトリが存在しません",
+                    task_dir=task_dir,
+                )
+                return True
 
-            # タスク固有のitems.dbに最終的な解放処理
-            if os.path.exists(items_db_path):
+            # 共有しているitems.dbの接続を破棄し、WALを書き戻して閉じる
+            release_db(items_db_path)
+            if os.path.isfile(items_db_path):
                 self._release_resources(items_db_path)
 
-            # 明示的にガベージコレクションを実行
-            import gc
-
-            gc.collect()
+            # 添付ファイルのロックを解放する（存在しない場合は何もしない）
+            self._release_directory_resources(attachments_dir)
 
-            # 削除前に追加の待機時間を設定
-            time.sleep(1.0)
+            # 削除前にファイルハンドルが解放されるまで待機
+            self._wait_for_release(task_dir)
 
-            # ディレクトリ削除を先に試みる
-            if os.path.exists(task_dir):
-                directory_deleted = self._try_remove_directory(task_dir)
-                if not directory_deleted:
-                    self.logger.error(
-                        f"タスクディレクトリの削除に失敗しました: {task_dir}。tasks.dbからの削除も中止します。"
-                    )
-                    # ディレクトリ削除に失敗した場合は、tasks.dbからの削除も行わない
-                    return False
-
-            # ディレクトリ削除が成功した場合のみ、tasks.dbからの削除を実行
-            self.db_manager.execute_update(
-                "DELETE FROM task_info WHERE id = ?", (task_id,)
-            )
-            self.db_manager.commit()
-            self.db_manager.disconnect()
-            self.logger.info(f"タスクID: {task_id} を完全に削除しました")
+            # ディレクトリ削除を先に試みる（既に存在しない場合は成功として扱われる）
+            if not self._try_remove_directory(task_dir):
+                self.logger.error(
+                    "タスクディレクトリの削除に失敗しました。tasks.dbからの削除も中止します。",
+                    task_dir=task_dir,
+                )
+                # ディレクトリ削除に失敗した場合は、tasks.dbからの削除も行わない
+                return False
 
+            _invalidate_items_db_exists(task_id)
             return True
         except Exception as e:
-            self.logger.error(f"タスク削除エラー: {str(e)}")
+            self.logger.error("タスクフォルダ削除エラー", task_id=task_id, error=str(e))
             return False
 
     def _release_resources(self, db_path: str) -> None:
@@ -295,40 +425,43 @@ class HomeContentModel:
         Args:
             db_path: データベースファイルのパス
         """
+        # 開いているファイルが削除を妨げるのはWindowsのみ
+        if os.name != "nt":
+            return
+
         try:
-            # 複数回接続解放を試みる
-            for attempt in range(3):
-                try:
-                    # 一時的なデータベース接続を作成して閉じる（既存の接続を強制的にクローズするため）
-                    tmp_db = DatabaseManager(db_path)
-                    # 明示的にVACUUMを実行してリソースを解放
-                    tmp_db.execute_update("PRAGMA optimize")
-                    tmp_db.execute_update("PRAGMA wal_checkpoint(FULL)")
-                    tmp_db.execute_update("VACUUM")
-                    # DB解放前に同期を強制
-                    tmp_db.execute_update("PRAGMA synchronous = OFF")
-                    tmp_db.commit()
-                    tmp_db.disconnect()
-                    self.logger.info(
-                        f"データベース接続解放試行 {attempt+1}/3 成功: {db_path}"
-                    )
-                    break
-                except Exception as db_ex:
-                    self.logger.warning(
-                        f"データベース接続解放試行 {attempt+1}/3 失敗: {str(db_ex)}"
-                    )
-                    # 少し長めに待機
-                    time.sleep(1.0)
+            # 一時的なデータベース接続を作成して閉じる（既存の接続を強制的にクローズするため）
+            # ファイルハンドルはcloseで解放されるため、VACUUMによる再構築や再試行は行わない
+            tmp_db = DatabaseManager(db_path)
+            tmp_db.execute_update("PRAGMA optimize")
+            # WALの内容を書き戻して-wal/-shmファイルを空にする
+            tmp_db.execute_update("PRAGMA wal_checkpoint(TRUNCATE)")
+            tmp_db.disconnect()
+            self.logger.info("データベース接続解放成功", db_path=db_path)
         except Exception as e:
-            self.logger.warning(f"リソース解放中にエラー: {str(e)}")
+            self.logger.warning("リソース解放中にエラー", error=str(e))
 
-        # 明示的にガベージコレクションを実行
-        import gc
+    def _wait_for_release(self, path: str) -> None:
+        """
+        パスを使用中のハンドルが閉じられるまで短い間隔で待機する（最大約1秒）
 
-        gc.collect()
+        Windowsではハンドルが開いている間は同名へのリネームも失敗するため、
+        それが成功した時点で待機を終える。それ以外の環境では待機しない。
 
-        # 接続解放後に追加の待機時間
-        time.sleep(1.0)
+        Args:
+            path: 対象のパス
+        """
+        if os.name != "nt":
+            return
+
+        for _ in range(20):
+            try:
+                os.rename(path, path)
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                time.sleep(0.05)
 
     def _release_directory_resources(self, directory_path: str) -> None:
         """
@@ -337,28 +470,43 @@ class HomeContentModel:
         Args:
             directory_path: ディレクトリのパス
         """
+        # ファイルを開いて閉じるロック解除はWindows特有の方法のため、それ以外では不要
+        if os.name != "nt":
+            return
+
         try:
-            # ディレクトリ内のファイルを列挙
-            if os.path.exists(directory_path) and os.path.isdir(directory_path):
-                for root, dirs, files in os.walk(directory_path):
-                    for file in files:
-                        try:
-                            file_path = os.path.join(root, file)
-                            # ファイルのロックを解除する試み（Windows特有の方法）
-                            # このロジックはプラットフォーム依存のため、追加の処理が必要な場合がある
-                            if os.path.exists(file_path):
-                                with open(file_path, "a"):
-                                    pass  # ファイルを開いて閉じるだけでロックが解除されることがある
-                        except Exception as file_ex:
-                            self.logger.warning(
-                                f"ファイルのロック解除試行に失敗: {file_path}, エラー: {str(file_ex)}"
-                            )
+            file_paths = list(_iter_files(directory_path))
+        except FileNotFoundError:
+            # ディレクトリが存在しない場合は何もしない
+            return
         except Exception as e:
-            self.logger.warning(f"ディレクトリリソース解放中にエラー: {str(e)}")
+            self.logger.warning("ディレクトリリソース解放中にエラー", error=str(e))
+            return
+
+        # 開いて閉じるだけのI/O待ちのため、スレッドで並列に実行する
+        with ThreadPoolExecutor(max_workers=_UNLOCK_MAX_WORKERS) as executor:
+            executor.map(self._unlock_file, file_paths)
+
+    def _unlock_file(self, file_path: str) -> None:
+        """
+        ファイルを開いて閉じ、ロックの解除を試みる（Windows特有の方法）
+
+        Args:
+            file_path: ファイルのパス
+        """
+        try:
+            with open(file_path, "a"):
+                pass  # ファイルを開いて閉じるだけでロックが解除されることがある
+        except Exception as file_ex:
+            self.logger.warning(
+                "ファイルのロック解除試行に失敗",
+                file_path=file_path,
+                error=str(file_ex),
+            )
 
     def _try_remove_directory(self, directory_path: str) -> bool:
         """
-        ディレクトリを削除する試行を複数回行う
+        ディレクトリを退避用の名前に変更し、中身の削除を別スレッドで行う
 
         Args:
             directory_path: 削除するディレクトリのパス
@@ -366,44 +514,105 @@ class HomeContentModel:
         Returns:
             bool: 削除が成功したかどうか
         """
-        # 最大試行回数
-        max_attempts = 3
+        # 開いているハンドルによる失敗はWindowsでのみ起こるため、再試行もWindowsのみ
+        max_attempts = 3 if os.name == "nt" else 1
 
         for attempt in range(max_attempts):
             try:
-                # ディレクトリが存在する場合のみ削除
-                if os.path.exists(directory_path):
-                    shutil.rmtree(directory_path)
-                    self.logger.info(f"ディレクトリ削除成功: {directory_path}")
-                    return True
-                else:
-                    # 既に削除されている場合は成功とみなす
-                    return True
+                # 退避用の名前に変更して即座に見えなくし、中身の削除は別スレッドで行う
+                trash_path = f"{directory_path}{_TRASH_MARKER}{uuid.uuid4().hex}"
+                os.rename(directory_path, trash_path)
+            except FileNotFoundError:
+                # 既に削除されている場合は成功とみなす
+                return True
             except PermissionError:
-                # ファイルが使用中の場合は少し待ってから再試行
+                # ファイルが使用中の場合は待機時間を倍にしながら再試行（10ms, 20ms）
                 self.logger.warning(
-                    f"ディレクトリ削除試行 {attempt+1}/{max_attempts} 失敗(PermissionError): {directory_path}"
+                    "ディレクトリ削除試行失敗(PermissionError)",
+                    attempt=attempt + 1,
+                    max_attempts=max_attempts,
+                    directory_path=directory_path,
                 )
-                time.sleep(1.0)  # 待機時間を長めに設定
+                if attempt + 1 < max_attempts:
+                    time.sleep(0.01 * (2**attempt))
             except OSError as os_ex:
-                # その他のOSエラー
+                # その他のOSエラーは待機しても解消しないため再試行しない
                 self.logger.warning(
-                    f"ディレクトリ削除試行 {attempt+1}/{max_attempts} 失敗(OSError): {directory_path}, エラー: {str(os_ex)}"
+                    "ディレクトリ削除試行失敗(OSError)",
+                    attempt=attempt + 1,
+                    max_attempts=max_attempts,
+                    directory_path=directory_path,
+                    error=str(os_ex),
                 )
-                time.sleep(1.0)
+                break
             except Exception as ex:
                 # 予期せぬエラー
                 self.logger.error(
-                    f"ディレクトリ削除試行 {attempt+1}/{max_attempts} 失敗(Exception): {directory_path}, エラー: {str(ex)}"
+                    "ディレクトリ削除試行失敗(Exception)",
+                    attempt=attempt + 1,
+                    max_attempts=max_attempts,
+                    directory_path=directory_path,
+                    error=str(ex),
                 )
-                time.sleep(1.0)
+                break
+            else:
+                threading.Thread(
+                    target=self._remove_tree, args=(trash_path,), daemon=True
+                ).start()
+                self.logger.info("ディレクトリ削除成功", directory_path=directory_path)
+                return True
 
         # 全ての試行が失敗
         self.logger.error(
-            f"ディレクトリ削除に失敗しました（{max_attempts}回試行）: {directory_path}"
+            "ディレクトリ削除に失敗しました", directory_path=directory_path
         )
         return False
 
+    def _remove_tree(self, directory_path: str) -> None:
+        """
+        ディレクトリを削除する（読み取り専用ファイルは書き込み可能にしてから削除する）
+
+        Args:
+            directory_path: 削除するディレクトリのパス
+        """
+        try:
+            shutil.rmtree(directory_path, onexc=_force_remove)
+        except Exception as e:
+            self.logger.warning(
+                "退避したディレクトリの削除に失敗",
+                directory_path=directory_path,
+                error=str(e),
+            )
+
+    def _sweep_trash_directories(self) -> None:
+        """
+        タスクフォルダ直下に残った退避フォルダ（*.trash.*）を削除する（ベストエフォート）
+
+        削除用のスレッドはデーモンのため、アプリの終了やファイルのロックで
+        退避フォルダが残ることがある
+        """
+        try:
+            with os.scandir(_TASKS_ROOT) as entries:
+                trash_paths = [
+                    entry.path
+                    for entry in entries
+                    if _TRASH_MARKER in entry.name
+                    and entry.is_dir(follow_symlinks=False)
+                ]
+        except FileNotFoundError:
+            # タスクフォルダがまだない場合は掃除するものもない
+            return
+        except Exception as e:
+            self.logger.warning("退避フォルダの検索に失敗", error=str(e))
+            return
+
+        for trash_path in trash_paths:
+            self._remove_tree(trash_path)
+        if trash_paths:
+            self.logger.info(
+                "残っていた退避フォルダの削除を試みました", count=len(trash_paths)
+            )
+
     def check_snapshot_and_extraction_plan(self, task_id: str) -> Dict[str, bool]:
         """
         スナップショットと抽出計画の存在を確認する
@@ -423,44 +632,30 @@ class HomeContentModel:
 
         try:
             # items.dbに接続
-            items_db_path = os.path.join("data", "tasks", str(task_id), "items.db")
-            if not os.path.exists(items_db_path):
+            _, items_db_path, _ = _task_paths(task_id)
+            if not _items_db_exists(task_id):
                 self.logger.warning(
-                    f"HomeContentModel: items.dbが見つかりません - {items_db_path}"
+                    "HomeContentModel: items.dbが見つかりません",
+                    items_db_path=items_db_path,
                 )
                 return result
 
-            items_db = DatabaseManager(items_db_path)
-
-            # スナップショットの存在確認
-            snapshot_query = "SELECT COUNT(*) as count FROM outlook_snapshot"
-            snapshot_result = items_db.execute_query(snapshot_query)
-            if snapshot_result and snapshot_result[0].get("count", 0) > 0:
-                result["has_snapshot"] = True
-
-            # 抽出計画の存在確認
-            plan_query = "SELECT COUNT(*) as count FROM mail_tasks WHERE task_id = ?"
-            plan_result = items_db.execute_query(plan_query, (task_id,))
-            if plan_result and plan_result[0].get("count", 0) > 0:
-                result["has_extraction_plan"] = True
-
-            # 抽出進捗の確認
-            progress_query = """
-            SELECT status FROM task_progress 
-            WHERE task_id = ? 
-            ORDER BY last_updated_at DESC LIMIT 1
-            """
-            progress_result = items_db.execute_query(progress_query, (task_id,))
-
-            if progress_result:
-                status = progress_result[0].get("status")
+            # 共有の接続を再利用する（タスク削除時にrelease_dbで閉じられる）
+            items_db = get_db(items_db_path)
+
+            # スナップショット・抽出計画・抽出進捗を1回のクエリで確認
+            rows = items_db.execute_query_tuples(
+                _SQL_CHECK_TASK_STATE, (task_id, task_id)
+            )
+            if rows:
+                has_snapshot, has_plan, status = rows[0]
+                result["has_snapshot"] = bool(has_snapshot)
+                result["has_extraction_plan"] = bool(has_plan)
                 if status == "processing":
                     result["extraction_in_progress"] = True
                 elif status == "completed":
                     result["extraction_completed"] = True
 
-            items_db.disconnect()
-
             self.logger.info(
                 "HomeContentModel: スナップショットと抽出計画の確認完了",
                 task_id=task_id,
@@ -488,7 +683,7 @@ class HomeContentModel:
         """
         try:
             # OutlookExtractionServiceを使用してスナップショットを作成
-            extraction_service = OutlookExtractionService(task_id)
+            extraction_service = self._create_extraction_service(task_id)
 
             # 初期化に失敗した場合
             if not extraction_service.initialize():
@@ -552,7 +747,7 @@ class HomeContentModel:
                 return True
 
             # OutlookExtractionServiceを使用して抽出を開始
-            extraction_service = OutlookExtractionService(task_id)
+            extraction_service = self._create_extraction_service(task_id)
 
             # 初期化に失敗した場合
             if not extraction_service.initialize():
@@ -582,3 +777,47 @@ class HomeContentModel:
                 "HomeContentModel: メール抽出作業エラー", task_id=task_id, error=str(e)
             )
             return False
+
+    def _create_extraction_service(self, task_id: str):
+        """
+        tasks.dbと共有のitems.dbの接続を渡して抽出サービスを生成する
+
+        Args:
+            task_id: タスクID
+
+        Returns:
+            OutlookExtractionService: 抽出サービス
+        """
+        # Outlook（COM）関連モジュールは起動時に読み込まないよう、使用時にインポート
+        from src.models.outlook.outlook_extraction_service import (
+            OutlookExtractionService,
+        )
+
+        items_db_path = _task_paths(task_id)[1]
+        return OutlookExtractionService(
+            task_id, items_db=get_db(items_db_path), tasks_db=self.db_manager
+        )
+
+    async def create_outlook_snapshot_async(self, task_id: str) -> bool:
+        """
+        スナップショットの作成を別スレッドで実行する（イベントループをブロックしない）
+
+        Args:
+            task_id: タスクID
+
+        Returns:
+            bool: 記録が成功したかどうか
+        """
+        return await asyncio.to_thread(self.create_outlook_snapshot, task_id)
+
+    async def start_mail_extraction_async(self, task_id: str) -> bool:
+        """
+        メール抽出を別スレッドで実行する（イベントループをブロックしない）
+
+        Args:
+            task_id: タスクID
+
+        Returns:
+            bool: 開始が成功したかどうか
+        """
+        return await asyncio.to_thread(self.start_mail_extraction, task_id)
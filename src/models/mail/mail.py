@@ -1,8 +1,10 @@
 # 取得したメールデータの加工
 
+import re
 from typing import List
 
-import ref
+# <>で囲まれた文字列を抽出する正規表現
+_BRACKET_RE = re.compile(r"<([^>]*)>")
 
 
 class Bcc:
@@ -11,22 +13,20 @@ class Bcc:
         """
         メール本文から<>で囲まれた文字列を抽出する
         """
-        # 正規表現を使用して[]で囲まれた文字列を抽出
-        pattern = r"<([^>]*)>"
-        matches = re.findall(pattern, body_text)
-        return matches
+        # コンパイル済みの正規表現を使用して<>で囲まれた文字列を抽出
+        return _BRACKET_RE.findall(body_text)
 
     @staticmethod
     def extract_bcc_addresses(recipient: str, address_list: List[str]) -> List[str]:
         """
         メール本文からBCCアドレスを抽出する
         """
-        bcc_addresses = []
-        unique_address_list = list(set(address_list))
-        for address in unique_address_list:
-            if address not in recipient:
-                bcc_addresses.append(address)
-        return bcc_addresses
+        # 重複を除いたアドレスのうち、宛先に含まれないものをBCCとみなす
+        return [
+            address
+            for address in dict.fromkeys(address_list)
+            if address not in recipient
+        ]
 
     @staticmethod
     def create(body_text: str, recipient: str) -> List[str]:
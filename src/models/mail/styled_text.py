@@ -1,30 +1,214 @@
 # ハイライトされたMail本文の取得
 
 import re
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
 import flet as ft
 
 from src.views.styles.color import Colors
 from src.views.styles.style import AppTheme
 
+try:
+    import ahocorasick
+except ImportError:  # 未インストールの環境では正規表現で検索する
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:  # Windows等で利用できない環境では他の方法で検索する
+    hyperscan = None
+
+# re.IGNORECASEはドットなしのıをi・Iと同一視するが、casefoldでは区別されるため揃える
+_CASEFOLD_FIXES = str.maketrans({"ı": "i"})
+
+
+def _casefold(text: str) -> str:
+    """
+    re.IGNORECASEと同じ文字を同一視するよう、テキストをcasefoldする
+    （σ/ς/Σやs/ſはcasefoldで揃い、ı/iは_CASEFOLD_FIXESで揃える）
+    """
+    return text.casefold().translate(_CASEFOLD_FIXES)
+
+
+@lru_cache(maxsize=128)
+def _compile_word_pattern(target_words: Tuple[str, ...]) -> re.Pattern:
+    """
+    対象単語のタプルから大文字小文字を区別しない検索パターンを生成する
+
+    同じ単語リストで繰り返しハイライトする際に再コンパイルを避けるためキャッシュする
+    （重なる単語の優先順位が変わらないよう、並び順は入力のまま保持する）
+    splitで一致部分も返すよう、全体をキャプチャグループで囲む
+    """
+    return re.compile("(" + "|".join(map(re.escape, target_words)) + ")", re.IGNORECASE)
+
+
+@lru_cache(maxsize=128)
+def _build_word_automaton(target_words: Tuple[str, ...]):
+    """
+    対象単語のタプルからcasefold済みのAho-Corasickオートマトンを構築する
+
+    値には(入力順の位置, 単語長)を持たせ、同じ位置で始まる単語の優先順位を
+    正規表現の選択と同じく入力順で判定できるようにする
+    casefoldで文字数が変わる単語（ßなど）を含む場合は位置がずれるためNoneを返す
+    """
+    if any(len(_casefold(word)) != len(word) for word in target_words):
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for index, word in enumerate(target_words):
+        key = _casefold(word)
+        if not automaton.exists(key):
+            automaton.add_word(key, (index, len(key)))
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=128)
+def _build_word_database(target_words: Tuple[str, ...]):
+    """
+    対象単語のタプルから大文字小文字を区別しないHyperscanのデータベースを構築する
+
+    パターンIDには入力順の位置を使い、一致の開始位置も報告させる
+    """
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    database.compile(
+        expressions=[re.escape(word).encode("ascii") for word in target_words],
+        ids=list(range(len(target_words))),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST]
+        * len(target_words),
+    )
+    return database
+
+
+@lru_cache(maxsize=128)
+def _word_first_chars(target_words: Tuple[str, ...]) -> frozenset:
+    """
+    対象単語の先頭文字（casefold済み）の集合を返す（一致し得ないテキストの事前判定用）
+    """
+    return frozenset(_casefold(word)[0] for word in target_words)
+
+
+def _select_leftmost(hits: List[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+    """
+    (開始, 入力順の位置, 終了)の一致一覧から、正規表現の選択と同じく
+    左端優先・同位置は入力順優先で重ならない範囲を選ぶ
+    """
+    word_spans = []
+    last_end = 0
+    for start, _, end in sorted(hits):
+        if start >= last_end:
+            word_spans.append((start, end))
+            last_end = end
+    return word_spans
+
+
+def _slice_by_spans(text: str, word_spans: List[Tuple[int, int]]) -> List[str]:
+    """
+    一致範囲(開始, 終了)の一覧でテキストを区切り、非一致・一致を交互に並べて返す
+    """
+    boundaries = [0]
+    for start, end in word_spans:
+        boundaries += (start, end)
+    boundaries.append(len(text))
+    return [text[start:end] for start, end in zip(boundaries, boundaries[1:])]
+
+
+def _split_by_words(text: str, target_words: Tuple[str, ...]) -> List[str]:
+    """
+    テキストを対象単語の一致部分で分割する
+
+    非一致・一致・非一致…の順に交互に並べて返す（偶数番目が非一致、奇数番目が一致）
+    target_wordsには空文字列を含めないこと
+    """
+    # 単語がない場合や、どの単語の先頭文字も含まないテキストは走査しない
+    if not target_words:
+        return [text]
+    folded = _casefold(text)
+    if _word_first_chars(target_words).isdisjoint(folded):
+        return [text]
+
+    # ASCIIのみの場合はバイト位置と文字位置が一致するためHyperscanで走査する
+    if (
+        hyperscan is not None
+        and text.isascii()
+        and all(word.isascii() for word in target_words)
+    ):
+        hits = []
+
+        def on_match(index, start, end, flags, context):
+            hits.append((start, index, end))
+
+        _build_word_database(target_words).scan(
+            text.encode("ascii"), match_event_handler=on_match
+        )
+        return _slice_by_spans(text, _select_leftmost(hits))
+
+    automaton = _build_word_automaton(target_words) if ahocorasick is not None else None
+    # casefoldで文字数が変わると位置がずれるため正規表現で分割する
+    # （キャプチャグループ付きのsplitは非一致・一致を交互に返す）
+    if automaton is None or len(folded) != len(text):
+        return _compile_word_pattern(target_words).split(text)
+
+    # 全一致を一度の走査で集めてから重なりを除く
+    return _slice_by_spans(
+        text,
+        _select_leftmost(
+            [
+                (end - length + 1, index, end + 1)
+                for end, (index, length) in automaton.iter(folded)
+            ]
+        ),
+    )
+
+
+@lru_cache(maxsize=32)
+def _text_style(style_items: Tuple[Tuple[str, Any], ...]) -> ft.TextStyle:
+    """
+    スタイル指定の項目からTextStyleを生成する
+
+    同じ指定の辞書が描画ごとに渡されるため、生成済みのTextStyleを使い回す
+    """
+    return ft.TextStyle(**dict(style_items))
+
+
+def _to_text_style(style: Dict[str, Any]) -> ft.TextStyle:
+    """
+    スタイル指定の辞書をTextStyleに変換する
+    """
+    style_items = tuple(sorted(style.items()))
+    try:
+        return _text_style(style_items)
+    except TypeError:
+        # ハッシュできない値を含む場合はキャッシュせずに生成する
+        return ft.TextStyle(**style)
+
+
+@lru_cache(maxsize=1)
+def _default_styles() -> Tuple[ft.TextStyle, ft.TextStyle]:
+    """
+    既定の(一致部分, 非一致部分)のスタイルを返す（全インスタンスで共有する）
+    """
+    theme = AppTheme()
+    match_style = ft.TextStyle(
+        color=ft.colors.WHITE,
+        bgcolor=ft.Colors.DEEP_ORANGE,
+        weight=ft.FontWeight.BOLD,
+        size=theme.BODY_SIZE,
+    )
+    no_match_style = ft.TextStyle(
+        color=Colors.TEXT_PRIMARY,
+        bgcolor=Colors.BACKGROUND,
+        weight=ft.FontWeight.NORMAL,
+        size=theme.BODY_SIZE,
+    )
+    return match_style, no_match_style
+
 
 class StyledText:
     def __init__(self):
         self.theme = AppTheme()
-        self.default_match_style = ft.TextStyle(
-            color=ft.colors.WHITE,
-            bgcolor=ft.Colors.DEEP_ORANGE,
-            weight=ft.FontWeight.BOLD,
-            size=self.theme.BODY_SIZE,
-        )
-
-        self.default_no_match_style = ft.TextStyle(
-            color=Colors.TEXT_PRIMARY,
-            bgcolor=Colors.BACKGROUND,
-            weight=ft.FontWeight.NORMAL,
-            size=self.theme.BODY_SIZE,
-        )
+        self.default_match_style, self.default_no_match_style = _default_styles()
 
     def _style_specific_words(
         self, text: str, target_words: List, match_style: Dict, non_match_style: Dict
@@ -32,40 +216,17 @@ class StyledText:
         """
         特定の単語にスタイルを適用する
         """
-        spans = []
-        pattern = re.compile("|".join(map(re.escape, target_words)), re.IGNORECASE)
-        last_end = 0
-
-        for match in pattern.finditer(text):
-            # マッチした部分の前のテキストを追加
-            if match.start() > last_end:
-                spans.append(
-                    ft.TextSpan(
-                        text=text[last_end : match.start()],
-                        style=non_match_style,
-                    )
-                )
-
-            # マッチした部分を追加
-            spans.append(
-                ft.TextSpan(
-                    text=match.group(),
-                    style=match_style,
-                )
-            )
-
-            last_end = match.end()
-
-        # 残りのテキストを追加
-        if last_end < len(text):
-            spans.append(
-                ft.TextSpan(
-                    text=text[last_end:],
-                    style=non_match_style,
-                )
-            )
-
-        return spans
+        # 空文字列は幅0の一致にしかならないため対象から除く
+        words = tuple(word for word in target_words if word)
+
+        # 分割結果は偶数番目が非一致・奇数番目が一致
+        text_span = ft.TextSpan
+        styles = (non_match_style, match_style)
+        return [
+            text_span(text=part, style=styles[i % 2])
+            for i, part in enumerate(_split_by_words(text, words))
+            if part
+        ]
 
     def generate_styled_text(
         self,
@@ -80,12 +241,12 @@ class StyledText:
         if match_style is None:
             match_style = self.default_match_style
         elif isinstance(match_style, dict):
-            match_style = ft.TextStyle(**match_style)
+            match_style = _to_text_style(match_style)
 
         if non_match_style is None:
             non_match_style = self.default_no_match_style
         elif isinstance(non_match_style, dict):
-            non_match_style = ft.TextStyle(**non_match_style)
+            non_match_style = _to_text_style(non_match_style)
 
         return ft.Text(
             spans=self._style_specific_words(
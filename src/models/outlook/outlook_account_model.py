@@ -1,14 +1,47 @@
 # Outlookアカウント・フォルダ管理モデル
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 
 from win32com.client import CDispatch
 
-from src.core.database import DatabaseManager
+from src.core.database import get_db
 from src.models.outlook.outlook_base_model import OutlookBaseModel
 from src.util.object_util import get_safe
 
+# フォルダを1文で追加・更新する（store_idとentry_idの組で既存行を判定）
+_SQL_UPSERT_FOLDER = """
+INSERT INTO folders (
+    entry_id, store_id, name, path, parent_folder_id, item_count, unread_count,
+    last_sync, created_at, updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (store_id, entry_id) DO UPDATE SET
+    name = excluded.name,
+    path = excluded.path,
+    parent_folder_id = excluded.parent_folder_id,
+    item_count = excluded.item_count,
+    unread_count = excluded.unread_count,
+    last_sync = excluded.last_sync,
+    updated_at = excluded.updated_at
+"""
+
+# アカウントを1文で追加・更新する（store_idで既存行を判定）
+_SQL_UPSERT_ACCOUNT = """
+INSERT INTO accounts (
+    store_id, displayname, email_address, last_sync, created_at, updated_at
+) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (store_id) DO UPDATE SET
+    displayname = excluded.displayname,
+    email_address = excluded.email_address,
+    last_sync = excluded.last_sync,
+    updated_at = excluded.updated_at
+"""
+
+# ルートフォルダ単位のセーブポイント（1つのフォルダの失敗で全体を取り消さない）
+_SQL_SAVEPOINT_ROOT = "SAVEPOINT root_folder"
+_SQL_RELEASE_ROOT = "RELEASE SAVEPOINT root_folder"
+_SQL_ROLLBACK_TO_ROOT = "ROLLBACK TO SAVEPOINT root_folder"
+
 
 class OutlookAccountModel(OutlookBaseModel):
     """
@@ -18,7 +51,8 @@ class OutlookAccountModel(OutlookBaseModel):
 
     def __init__(self):
         super().__init__()
-        self.db = DatabaseManager("data/outlook.db")
+        # 他のモデルと共有するoutlook.dbの接続を使う（接続とPRAGMA設定を使い回す）
+        self.db = get_db("data/outlook.db")
 
     # MARK: - Private Methods
     def _get_timestamp(self) -> str:
@@ -29,148 +63,154 @@ class OutlookAccountModel(OutlookBaseModel):
         """
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    def _save_folder(
-        self,
-        account_id: str,
-        folder,
-    ) -> None:
+    def _snapshot_folder(self, folder) -> dict:
         """
-        単一のフォルダ情報をデータベースに保存する
+        フォルダの保存に必要な属性を一度だけ読み出して辞書にする
+
+        COMの属性参照は呼び出しごとにプロセス間通信になるため、
+        以降の処理はこの辞書から値を読む
 
         Args:
-            account_id: アカウントID
             folder: フォルダオブジェクト
+
+        Returns:
+            dict: フォルダの属性
         """
-        # ログ用の情報を初期化
-        folder_info = {
-            "account_id": account_id,
-            "folder_id": "unknown",
-            "folder_name": "unknown",
-            "folder_path": "unknown",
-            "parent_folder_id": None,
+        entry_id = get_safe(folder, "EntryID")
+        if not entry_id:
+            # 保存対象外のため他の属性は読み出さない
+            return {"EntryID": None}
+
+        parent = get_safe(folder, "Parent")
+        folder_name = get_safe(folder, "Name", "unknown")
+        return {
+            "EntryID": entry_id,
+            "Name": folder_name,
+            "FolderPath": get_safe(folder, "FolderPath", "\\" + folder_name),
+            "ParentEntryID": get_safe(parent, "EntryID") if parent else None,
+            # Itemsが取得できない場合も例外にせず0件とする
+            "ItemCount": get_safe(get_safe(folder, "Items"), "Count", 0),
+            "UnReadItemCount": get_safe(folder, "UnReadItemCount", 0),
         }
 
-        try:
-            folder_id = get_safe(folder, "EntryID")
-            current_time = self._get_timestamp()
+    def _folder_row(self, account_id: str, snapshot: dict, current_time: str) -> tuple:
+        """
+        フォルダの属性から_SQL_UPSERT_FOLDERのパラメータを作成する
 
-            # 親フォルダIDを取得
-            parent_folder_id = None
-            parent = get_safe(folder, "Parent")
-            if parent:
-                parent_folder_id = get_safe(parent, "EntryID")
-
-            # フォルダ名とパスを取得
-            folder_name = get_safe(folder, "Name", "unknown")
-            folder_path = get_safe(folder, "FolderPath", "\\" + folder_name)
-            item_count = get_safe(folder, "Items", {}).Count
-            unread_count = get_safe(folder, "UnReadItemCount", 0)
-
-            # ログ用の情報を更新
-            folder_info.update(
-                {
-                    "folder_id": folder_id,
-                    "folder_name": folder_name,
-                    "folder_path": folder_path,
-                    "parent_folder_id": parent_folder_id,
-                    "item_count": item_count,
-                    "unread_count": unread_count,
-                }
-            )
+        Args:
+            account_id: アカウントID
+            snapshot: フォルダの属性（_snapshot_folderの戻り値）
+            current_time: 同期日時
 
-            # フォルダが既に存在するか確認
-            existing = self.db.execute_query(
-                "SELECT entry_id FROM folders WHERE store_id = ? AND entry_id = ?",
-                (account_id, folder_id),
-            )
+        Returns:
+            tuple: _SQL_UPSERT_FOLDERのパラメータ
+        """
+        return (
+            snapshot["EntryID"],
+            account_id,
+            snapshot["Name"],
+            snapshot["FolderPath"],
+            snapshot["ParentEntryID"],
+            snapshot["ItemCount"],
+            snapshot["UnReadItemCount"],
+            current_time,
+            current_time,
+            current_time,
+        )
+
+    def _iter_subfolders(self, parent_folder) -> Iterator[dict]:
+        """
+        サブフォルダを明示的なスタックで深さ優先に走査し、属性を順に返す
 
-            if existing:
-                # 既存のフォルダを更新
-                self.db.execute_update(
-                    """
-                    UPDATE folders 
-                    SET name = ?, path = ?, parent_folder_id = ?, item_count = ?, unread_count = ?, last_sync = ?, updated_at = ?
-                    WHERE store_id = ? AND entry_id = ?
-                    """,
-                    (
-                        folder_name,
-                        folder_path,
-                        parent_folder_id,
-                        item_count,
-                        unread_count,
-                        current_time,
-                        current_time,
-                        account_id,
-                        folder_id,
-                    ),
-                )
-            else:
-                # 新しいフォルダを挿入
-                self.db.execute_update(
-                    """
-                    INSERT INTO folders 
-                    (entry_id, store_id, name, path, parent_folder_id, item_count, unread_count, last_sync, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        folder_id,
-                        account_id,
-                        folder_name,
-                        folder_path,
-                        parent_folder_id,
-                        item_count,
-                        unread_count,
-                        current_time,
-                        current_time,
-                        current_time,
-                    ),
-                )
-        except Exception as e:
-            # エラー情報を文字列に変換して記録
-            error_info = {
-                "error": str(e),
-                "folder_info": folder_info,
-            }
-            self.logger.error(f"フォルダの保存に失敗しました: {error_info}")
-            raise
+        再帰せずに、元の再帰処理と同じ順序（親の次にその配下）で訪れる
+
+        Args:
+            parent_folder: 親フォルダオブジェクト
 
-    def _save_subfolders_recursively(self, account_id: str, parent_folder) -> None:
+        Yields:
+            dict: サブフォルダの属性（_snapshot_folderの戻り値）
+        """
+        stack = [(parent_folder, None)]
+        while stack:
+            folder, snapshot = stack.pop()
+            if snapshot is not None:
+                yield snapshot
+
+            try:
+                children = []
+                for subfolder in self._service.get_folders(folder):
+                    child_snapshot = self._snapshot_folder(subfolder)
+                    # EntryIDを持つフォルダのみを対象とする
+                    if child_snapshot["EntryID"]:
+                        children.append((subfolder, child_snapshot))
+            except Exception as e:
+                # 取得に失敗したフォルダの配下は飛ばし、他のフォルダの走査を続ける
+                self.logger.error(f"サブフォルダの取得に失敗しました: {str(e)}")
+                continue
+
+            # 先頭の子から訪れるよう逆順に積む
+            stack.extend(reversed(children))
+
+    def _collect_subfolder_rows(
+        self, account_id: str, parent_folder, current_time: str
+    ) -> list:
         """
-        サブフォルダを再帰的に保存する
+        配下のすべてのサブフォルダについて_SQL_UPSERT_FOLDERのパラメータを集める
 
         Args:
             account_id: アカウントID
             parent_folder: 親フォルダオブジェクト
+            current_time: 同期日時
+
+        Returns:
+            list: 配下のすべてのサブフォルダのパラメータ
         """
+        return [
+            self._folder_row(account_id, snapshot, current_time)
+            for snapshot in self._iter_subfolders(parent_folder)
+        ]
+
+    def _write_folder_rows(self, rows: list) -> bool:
+        """
+        集めたフォルダ情報を1回のトランザクションでまとめて保存する
+
+        Args:
+            rows: _SQL_UPSERT_FOLDERのパラメータのリスト
+
+        Returns:
+            bool: 保存が成功した場合はTrue
+        """
+        # 書き込みロックを取得できない場合は、自動コミットで部分的に保存しないよう中止する
+        if not self.db.begin_immediate():
+            self.logger.error("フォルダ情報の一括保存を開始できませんでした")
+            return False
+
         try:
-            subfolders = self._service.get_folders(parent_folder)
-            # EntryIDを持つフォルダのみをフィルタリング
-            valid_subfolders = [
-                folder for folder in subfolders if get_safe(folder, "EntryID")
-            ]
-            for subfolder in valid_subfolders:
-                self._save_folder(account_id, subfolder)
-                # さらに深い階層のフォルダも保存
-                self._save_subfolders_recursively(account_id, subfolder)
+            self.db.execute_many(_SQL_UPSERT_FOLDER, rows)
+            self.db.commit()
+            return True
         except Exception as e:
-            self.logger.error(f"サブフォルダの再帰的保存に失敗しました: {str(e)}")
+            self.db.rollback()
+            self.logger.error(f"フォルダ情報の一括保存に失敗しました: {str(e)}")
+            return False
 
     # MARK: - Account Methods
     def get_account(self) -> CDispatch:
         """Outlookのデフォルトアカウントを取得する"""
         return self._service.get_account()
 
-    def save_account(self, account: CDispatch) -> bool:
+    def save_account(self, account: CDispatch, current_time: str = None) -> bool:
         """アカウント情報をデータベースに保存する
 
         Args:
             account: Outlookアカウントオブジェクト
+            current_time: 同期日時（省略時は現在時刻）
 
         Returns:
             bool: 保存が成功した場合はTrue
         """
         try:
-            current_time = self._get_timestamp()
+            current_time = current_time or self._get_timestamp()
 
             # StoreIDを主キーとして使用
             delivery_store = get_safe(account, "DeliveryStore")
@@ -185,45 +225,19 @@ class OutlookAccountModel(OutlookBaseModel):
 
             self.logger.info(f"アカウント情報を保存します: {account_info}")
 
-            existing = self.db.execute_query(
-                "SELECT store_id FROM accounts WHERE store_id = ?",
-                (store_id,),
+            # 既存の有無を問い合わせず、1文で追加または更新する
+            self.db.execute_update(
+                _SQL_UPSERT_ACCOUNT,
+                (
+                    store_id,
+                    account_info["display_name"],
+                    account_info["email_address"],
+                    current_time,
+                    current_time,
+                    current_time,
+                ),
             )
 
-            if existing:
-                # 既存のアカウントを更新
-                self.db.execute_update(
-                    """
-                    UPDATE accounts 
-                    SET displayname = ?, email_address = ?, last_sync = ?, updated_at = ?
-                    WHERE store_id = ?
-                    """,
-                    (
-                        get_safe(account, "DisplayName"),
-                        get_safe(account, "SmtpAddress"),
-                        current_time,
-                        current_time,
-                        store_id,
-                    ),
-                )
-            else:
-                # 新しいアカウントを挿入
-                self.db.execute_update(
-                    """
-                    INSERT INTO accounts 
-                    (store_id, displayname, email_address, last_sync, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        store_id,
-                        get_safe(account, "DisplayName"),
-                        get_safe(account, "SmtpAddress"),
-                        current_time,
-                        current_time,
-                        current_time,
-                    ),
-                )
-
             self.logger.info(f"アカウント情報を保存しました: {account_info}")
             return True
         except Exception as e:
@@ -235,8 +249,7 @@ class OutlookAccountModel(OutlookBaseModel):
         """現在のアカウントのルートフォルダを取得する"""
         self.logger.info("アカウントのルートフォルダを取得します")
         try:
-            # 現在のアカウントを取得
-            account = self._service.get_account()
+            # アカウントは絞り込みに使わないため取得しない（COM呼び出しを省く）
             root_folders = self._service.get_root_folders()
 
             if not root_folders:
@@ -294,18 +307,19 @@ class OutlookAccountModel(OutlookBaseModel):
                 )
                 return False
 
-            # フォルダ情報をデータベースに保存
-            self._save_folder(account_id, folder)
+            # 同期日時は一度だけ求めて全フォルダで共有する
+            current_time = self._get_timestamp()
 
-            # サブフォルダを取得して再帰的に保存
-            subfolders = self._service.get_folders(folder)
-            # EntryIDを持つフォルダのみをフィルタリング
-            valid_subfolders = [
-                subfolder for subfolder in subfolders if hasattr(subfolder, "EntryID")
+            # フォルダと配下のすべてのサブフォルダを集めてから、まとめて保存する
+            # （Outlookの走査中は書き込みロックを保持しない）
+            rows = [
+                self._folder_row(
+                    account_id, self._snapshot_folder(folder), current_time
+                )
             ]
-            for subfolder in valid_subfolders:
-                self._save_folder(account_id, subfolder)
-                self._save_subfolders_recursively(account_id, subfolder)
+            rows.extend(self._collect_subfolder_rows(account_id, folder, current_time))
+            if not self._write_folder_rows(rows):
+                return False
 
             self.logger.info(f"フォルダ情報をデータベースに保存しました: {log_info}")
             return True
@@ -328,10 +342,8 @@ class OutlookAccountModel(OutlookBaseModel):
                 self.logger.error("アカウントの取得に失敗しました")
                 return False
 
-            # アカウント情報を保存
-            if not self.save_account(account):
-                self.logger.error("アカウント情報の保存に失敗しました")
-                return False
+            # 同期日時は一度だけ求めてアカウントと全フォルダで共有する
+            current_time = self._get_timestamp()
 
             account_id = get_safe(get_safe(account, "DeliveryStore"), "StoreID")
 
@@ -342,26 +354,59 @@ class OutlookAccountModel(OutlookBaseModel):
                 return False
 
             # アカウントに紐づくフォルダのみをフィルタリング
-            folder_list = [
-                folder
-                for folder in root_folders
-                if get_safe(folder, "EntryID")  # EntryIDの存在のみをチェック
-            ]
+            # （属性は一度だけ読み出し、フィルタと保存の両方で使う）
+            folder_list = []
+            for folder in root_folders:
+                snapshot = self._snapshot_folder(folder)
+                if snapshot["EntryID"]:  # EntryIDの存在のみをチェック
+                    folder_list.append((folder, snapshot))
 
             if not folder_list:
                 self.logger.error("アカウントに紐づくフォルダが見つかりませんでした")
                 return False
 
-            # 各フォルダとそのサブフォルダを保存
-            for folder in folder_list:
-                try:
-                    self._save_folder(account_id, folder)
-                    self._save_subfolders_recursively(account_id, folder)
-                except Exception as e:
-                    self.logger.error(
-                        f"フォルダの保存中にエラーが発生しました: {str(e)}"
-                    )
-                    continue
+            # ルートフォルダごとに、そのフォルダとサブフォルダの情報を集める
+            # （Outlookの走査中は書き込みロックを保持しない）
+            root_rows = []
+            for folder, snapshot in folder_list:
+                rows = [self._folder_row(account_id, snapshot, current_time)]
+                rows.extend(
+                    self._collect_subfolder_rows(account_id, folder, current_time)
+                )
+                root_rows.append((snapshot["Name"], rows))
+
+            # アカウント情報と全フォルダを1回のトランザクションで保存する
+            # （書き込みロックを取得できない場合は、自動コミットで部分的に保存しないよう中止する）
+            if not self.db.begin_immediate():
+                self.logger.error(
+                    "アカウントのフォルダ情報の保存を開始できませんでした"
+                )
+                return False
+
+            try:
+                if not self.save_account(account, current_time):
+                    self.logger.error("アカウント情報の保存に失敗しました")
+                    self.db.rollback()
+                    return False
+
+                for folder_name, rows in root_rows:
+                    # 失敗したルートフォルダの分だけ取り消し、他のフォルダの保存を続ける
+                    self.db.execute_update(_SQL_SAVEPOINT_ROOT)
+                    try:
+                        self.db.execute_many(_SQL_UPSERT_FOLDER, rows)
+                        self.db.execute_update(_SQL_RELEASE_ROOT)
+                    except Exception as e:
+                        self.db.execute_update(_SQL_ROLLBACK_TO_ROOT)
+                        self.db.execute_update(_SQL_RELEASE_ROOT)
+                        self.logger.error(
+                            f"フォルダ情報の保存に失敗しました: {folder_name} - {str(e)}"
+                        )
+                        continue
+
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
 
             self.logger.info(
                 f"アカウントのフォルダ情報をデータベースに保存しました: account_id={account_id}"
@@ -2,14 +2,16 @@ import asyncio
 import datetime
 import json
 import os
+import queue
 import re
+import threading
 import time
 import uuid
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from markdownify import markdownify
 
-from src.core.database import DatabaseManager
+from src.core.database import DatabaseManager, get_db
 from src.core.logger import get_logger
 from src.models.azure.ai_review import AIReview
 from src.models.outlook.outlook_client import OutlookClient
@@ -17,37 +19,149 @@ from src.models.outlook.outlook_item_model import OutlookItemModel
 from src.models.outlook.outlook_service import OutlookService
 from src.util.object_util import get_safe
 
+# プロジェクトのルートディレクトリとタスクフォルダのルート（添付ファイルの保存先に使用）
+_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+_TASKS_ROOT = os.path.join(_ROOT, "data", "tasks")
+
+# スナップショットの有無のみを確認する（最初の1行で止まる）
+_SQL_SNAPSHOT_EXISTS = "SELECT EXISTS (SELECT 1 FROM outlook_snapshot)"
+
+# ATTACHしたoutlook.dbのfoldersをoutlook_snapshotへSQLite内で直接コピーする
+_SQL_COPY_SNAPSHOT = """
+INSERT INTO outlook_snapshot (
+    entry_id, store_id, name, path, parent_folder_id,
+    folder_type, folder_class, item_count, unread_count,
+    snapshot_time
+)
+SELECT
+    entry_id, store_id, name, path, parent_folder_id,
+    folder_type, folder_class, item_count, unread_count,
+    datetime('now')
+FROM outlook_src.folders
+"""
+
+_SQL_INSERT_MAIL_TASK = """
+INSERT INTO mail_tasks (
+    task_id, message_id, subject, sent_time,
+    status, mail_fetch_status, attachment_status,
+    ai_review_status, created_at
+) VALUES (?, ?, ?, ?, 'pending', 'pending', 'pending', 'pending', ?)
+"""
+
+_SQL_SELECT_PENDING_MAIL_TASKS = """
+SELECT id, message_id
+FROM mail_tasks
+WHERE task_id = ? AND status = 'pending'
+"""
+
+_SQL_MARK_MAIL_TASK_PROCESSING = """
+UPDATE mail_tasks
+SET status = 'processing', mail_fetch_status = 'processing', started_at = ?
+WHERE id = ?
+"""
+
+# メールごとに実行するため、文字列を共有して接続のステートメントキャッシュに載せる
+_SQL_INSERT_MAIL_ITEM = """
+INSERT INTO mail_items (
+    entry_id, store_id, folder_id, conversation_id, conversation_index, thread_id,
+    message_type, subject, sent_time, received_time,
+    body, unread, message_size, task_id, has_attachments, attachment_count, processed_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+"""
+
+_SQL_MARK_MAIL_TASK_FETCHED = """
+UPDATE mail_tasks
+SET status = 'processing', mail_fetch_status = 'success'
+WHERE task_id = ? AND message_id = ?
+"""
+
+_SQL_INSERT_PARTICIPANT = """
+INSERT OR IGNORE INTO participants (
+    mail_id, user_id, participant_type, address_type
+) VALUES (?, ?, ?, 'SMTP')
+"""
+
+# 抽出計画の作成でOutlookから読み出すメールアイテムのプロパティ
+_PLAN_MAIL_ITEM_FIELDS = ("EntryID", "Subject", "ReceivedTime")
+
+# メール保存スレッドに渡す待ち行列の上限（COM取得がDB書き込みより先行しすぎないようにする）
+# 書き込みスレッドは溜まっているメールをこの件数まで1回のコミットでまとめて保存する
+_WRITE_QUEUE_SIZE = 16
+
+# 待ち行列が空くのを待つ間隔（秒）。この間隔ごとに書き込みスレッドの生存を確認する
+_WRITE_QUEUE_TIMEOUT = 1.0
+
+# まとめて保存する際に、1件の失敗で他のメールを巻き戻さないためのセーブポイント
+_SQL_SAVEPOINT_MAIL = "SAVEPOINT mail_item"
+_SQL_RELEASE_MAIL = "RELEASE SAVEPOINT mail_item"
+_SQL_ROLLBACK_TO_MAIL = "ROLLBACK TO SAVEPOINT mail_item"
+
+# Outlookの日付フィルターテンプレート
+_FILTER_RANGE_TMPL = "[ReceivedTime] >= '{s}' AND [ReceivedTime] <= '{e}'"
+_FILTER_START_TMPL = "[ReceivedTime] >= '{s}'"
+_FILTER_END_TMPL = "[ReceivedTime] <= '{e}'"
+
+# フィルターに埋め込む日付の形式（YYYY-MM-DD[ HH:MM[:SS]]）
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?$")
+
 
 class OutlookExtractionService:
     """Outlookからのメール抽出サービス"""
 
-    def __init__(self, task_id: str):
-        """初期化"""
+    def __init__(
+        self,
+        task_id: str,
+        items_db: Optional[DatabaseManager] = None,
+        outlook_db: Optional[DatabaseManager] = None,
+        tasks_db: Optional[DatabaseManager] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            task_id: タスクID
+            items_db: 呼び出し元と共有するitems.dbの接続（省略時はinitializeで取得）
+            outlook_db: 呼び出し元と共有するoutlook.dbの接続（省略時はinitializeで取得）
+            tasks_db: 呼び出し元と共有するtasks.dbの接続（省略時はinitializeで取得）
+        """
         self.task_id = task_id
         self.logger = get_logger()
         self.outlook_client = OutlookClient()
-        self.items_db = None
-        self.outlook_db = None
-        self.tasks_db = None
+        self.items_db = items_db
+        self.outlook_db = outlook_db
+        self.tasks_db = tasks_db
+        # 呼び出し元から渡された接続は呼び出し元が管理するため、cleanupで閉じない
+        self._injected_dbs = [
+            db for db in (items_db, outlook_db, tasks_db) if db is not None
+        ]
+        self._filter_cache = {}
+        self._write_queue = None
+        self._writer_thread = None
+        self._outlook_service = None
 
     def initialize(self) -> bool:
         """データベース接続の初期化"""
         try:
             # items.dbの接続
-            items_db_path = f"data/tasks/{self.task_id}/items.db"
-            self.items_db = DatabaseManager(items_db_path)
+            if self.items_db is None:
+                items_db_path = f"data/tasks/{self.task_id}/items.db"
+                self.items_db = get_db(items_db_path)
 
             # outlook.dbの接続
-            outlook_db_path = "data/outlook.db"
-            self.outlook_db = DatabaseManager(outlook_db_path)
+            if self.outlook_db is None:
+                outlook_db_path = "data/outlook.db"
+                self.outlook_db = get_db(outlook_db_path)
 
             # tasks.dbの接続
-            tasks_db_path = "data/tasks.db"
-            if not os.path.exists(tasks_db_path):
-                self.logger.error("tasks.dbが見つかりません", path=tasks_db_path)
-                return False
+            if self.tasks_db is None:
+                tasks_db_path = "data/tasks.db"
+                if not os.path.exists(tasks_db_path):
+                    self.logger.error("tasks.dbが見つかりません", path=tasks_db_path)
+                    return False
 
-            self.tasks_db = DatabaseManager(tasks_db_path)
+                self.tasks_db = get_db(tasks_db_path)
 
             return True
         except Exception as e:
@@ -55,13 +169,21 @@ class OutlookExtractionService:
             return False
 
     def cleanup(self):
-        """リソースの解放"""
-        if self.items_db:
-            self.items_db.disconnect()
-        if self.outlook_db:
-            self.outlook_db.disconnect()
-        if self.tasks_db:
-            self.tasks_db.disconnect()
+        """リソースの解放（呼び出し元から渡された接続は閉じない）"""
+        for db in (self.items_db, self.outlook_db, self.tasks_db):
+            if db and not any(db is injected for injected in self._injected_dbs):
+                db.disconnect()
+
+    def _get_outlook_service(self) -> OutlookService:
+        """
+        メール取得に使うOutlookServiceを取得する（初回のみ接続し、以降は再利用する）
+
+        Returns:
+            OutlookService: OutlookService
+        """
+        if self._outlook_service is None:
+            self._outlook_service = OutlookService()
+        return self._outlook_service
 
     def _format_date_string(self, date_value) -> str:
         """
@@ -102,6 +224,45 @@ class OutlookExtractionService:
         parts = date_str.replace("-", "/").rsplit(":", 1)
         return parts[0] if len(parts) > 1 else date_str.replace("-", "/")
 
+    def _build_date_filter(self, start_date: str, end_date: str) -> str:
+        """
+        抽出期間からOutlook用の日付フィルターを作成する
+
+        Args:
+            start_date: 開始日時（YYYY-MM-DD HH:MM:SS形式）
+            end_date: 終了日時（YYYY-MM-DD HH:MM:SS形式）
+
+        Returns:
+            str: Outlookのフィルター文字列（期間指定がない場合は空文字列）
+
+        Raises:
+            ValueError: 日付の形式が不正な場合
+        """
+        key = (start_date, end_date)
+        cached = self._filter_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # フィルター文字列に埋め込むため、想定外の文字を含む日付は受け付けない
+        for date_str in key:
+            if date_str and not _DATE_PATTERN.match(date_str):
+                raise ValueError(f"日付の形式が不正です: {date_str}")
+
+        start_formatted = self._format_outlook_date_filter(start_date)
+        end_formatted = self._format_outlook_date_filter(end_date)
+
+        if start_date and end_date:
+            date_filter = _FILTER_RANGE_TMPL.format(s=start_formatted, e=end_formatted)
+        elif start_date:
+            date_filter = _FILTER_START_TMPL.format(s=start_formatted)
+        elif end_date:
+            date_filter = _FILTER_END_TMPL.format(e=end_formatted)
+        else:
+            date_filter = ""
+
+        self._filter_cache[key] = date_filter
+        return date_filter
+
     def get_extraction_conditions(self) -> Optional[dict]:
         """
         抽出条件を取得する
@@ -144,18 +305,8 @@ class OutlookExtractionService:
             start_date = get_safe(task_info, "start_date")
             end_date = get_safe(task_info, "end_date")
 
-            # 日付形式を変換（共通関数を使用）
-            start_date_formatted = self._format_outlook_date_filter(start_date)
-            end_date_formatted = self._format_outlook_date_filter(end_date)
-
             # Outlookのフィルター形式に変換
-            date_filter = ""
-            if start_date and end_date:
-                date_filter = f"[ReceivedTime] >= '{start_date_formatted}' AND [ReceivedTime] <= '{end_date_formatted}'"
-            elif start_date:
-                date_filter = f"[ReceivedTime] >= '{start_date_formatted}'"
-            elif end_date:
-                date_filter = f"[ReceivedTime] <= '{end_date_formatted}'"
+            date_filter = self._build_date_filter(start_date, end_date)
 
             # get_safeを使用して安全にデータを取得
             conditions = {
@@ -192,61 +343,41 @@ class OutlookExtractionService:
         try:
             self.logger.info("Outlookスナップショット作成開始", task_id=self.task_id)
 
-            # トランザクション開始
-            self.items_db.begin_transaction()
-            self.outlook_db.begin_transaction()
-
-            try:
-                # outlook.dbからfoldersテーブルのデータを取得
-                folders_data = self.outlook_db.execute_query("SELECT * FROM folders")
-
-                if not folders_data:
-                    self.logger.warning(
-                        "フォルダデータが見つかりません", task_id=self.task_id
-                    )
+            # outlook.dbをATTACHする（トランザクション内ではATTACHできないため先に行う）
+            self.items_db.execute_update(
+                "ATTACH DATABASE ? AS outlook_src",
+                (os.path.abspath(self.outlook_db.db_path),),
+            )
 
-                # スナップショットのデータが既に存在するか確認
-                existing_count_result = self.items_db.execute_query(
-                    "SELECT COUNT(*) as count FROM outlook_snapshot"
-                )
-                existing_count = (
-                    existing_count_result[0].get("count", 0)
-                    if existing_count_result
-                    else 0
+            # トランザクション開始（outlook.dbは読み取りのみのためitems.dbのみ）
+            # 書き込みロックを取得できない場合は、自動コミットで部分的に書き込まないよう中止する
+            if not self.items_db.begin_immediate():
+                self.items_db.execute_update("DETACH DATABASE outlook_src")
+                self.logger.error(
+                    "スナップショット作成のトランザクションを開始できません",
+                    task_id=self.task_id,
                 )
+                return False
 
-                # データが既に存在する場合は削除
-                if existing_count > 0:
+            try:
+                # 既存のスナップショットデータを削除
+                deleted_count = self.items_db.execute_update(
+                    "DELETE FROM outlook_snapshot"
+                )
+                if deleted_count > 0:
                     self.logger.info(
-                        "既存のスナップショットデータを削除します", count=existing_count
+                        "既存のスナップショットデータを削除します", count=deleted_count
                     )
-                    self.items_db.execute_update("DELETE FROM outlook_snapshot")
 
-                # outlook_snapshotテーブルにデータを挿入
-                for folder in folders_data:
-                    query = """
-                    INSERT INTO outlook_snapshot (
-                        entry_id, store_id, name, path, parent_folder_id,
-                        folder_type, folder_class, item_count, unread_count,
-                        snapshot_time
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-                    """
-                    params = (
-                        get_safe(folder, "entry_id"),
-                        get_safe(folder, "store_id"),
-                        get_safe(folder, "name"),
-                        get_safe(folder, "path"),
-                        get_safe(folder, "parent_folder_id"),
-                        get_safe(folder, "folder_type"),
-                        get_safe(folder, "folder_class"),
-                        get_safe(folder, "item_count"),
-                        get_safe(folder, "unread_count"),
+                # outlook_snapshotテーブルにfoldersテーブルのデータをコピー
+                copied_count = self.items_db.execute_update(_SQL_COPY_SNAPSHOT)
+                if copied_count <= 0:
+                    self.logger.warning(
+                        "フォルダデータが見つかりません", task_id=self.task_id
                     )
-                    self.items_db.execute_update(query, params)
 
                 # トランザクションをコミット
                 self.items_db.commit()
-                self.outlook_db.commit()
                 self.logger.info(
                     "Outlookスナップショット作成成功", task_id=self.task_id
                 )
@@ -255,7 +386,6 @@ class OutlookExtractionService:
             except Exception as e:
                 # エラー時はトランザクションをロールバック
                 self.items_db.rollback()
-                self.outlook_db.rollback()
                 self.logger.error(
                     "スナップショット作成中のエラー（トランザクション内）",
                     task_id=self.task_id,
@@ -265,6 +395,9 @@ class OutlookExtractionService:
                 )
                 raise e
 
+            finally:
+                self.items_db.execute_update("DETACH DATABASE outlook_src")
+
         except Exception as e:
             self.logger.error(
                 "Outlookスナップショット作成エラー",
@@ -315,42 +448,34 @@ class OutlookExtractionService:
             self.logger.info("抽出計画作成開始", task_id=self.task_id)
 
             # トランザクション開始
-            self.items_db.begin_transaction()
-
-            try:
-                # 既存の抽出計画をチェック
-                existing_conditions = self.items_db.execute_query(
-                    "SELECT COUNT(*) as count FROM extraction_conditions WHERE task_id = ?",
-                    (self.task_id,),
-                )
-
-                existing_mail_tasks = self.items_db.execute_query(
-                    "SELECT COUNT(*) as count FROM mail_tasks WHERE task_id = ?",
-                    (self.task_id,),
+            # 書き込みロックを取得できない場合は、自動コミットで部分的に書き込まないよう中止する
+            if not self.items_db.begin_immediate():
+                self.logger.error(
+                    "抽出計画作成のトランザクションを開始できません",
+                    task_id=self.task_id,
                 )
+                return False
 
+            try:
                 # 既に抽出計画が存在する場合は削除して再作成
-                existing_conditions_count = (
-                    existing_conditions[0].get("count", 0) if existing_conditions else 0
+                # 件数を事前に数えず、DELETEの影響行数で既存の有無を判断する
+                deleted_conditions = self.items_db.execute_update(
+                    "DELETE FROM extraction_conditions WHERE task_id = ?",
+                    (self.task_id,),
                 )
-                if existing_conditions_count > 0:
-                    self.logger.info("既存の抽出条件を削除します", task_id=self.task_id)
-                    self.items_db.execute_update(
-                        "DELETE FROM extraction_conditions WHERE task_id = ?",
-                        (self.task_id,),
+                if deleted_conditions > 0:
+                    self.logger.info(
+                        "既存の抽出条件を削除しました", task_id=self.task_id
                     )
 
-                existing_mail_tasks_count = (
-                    existing_mail_tasks[0].get("count", 0) if existing_mail_tasks else 0
+                deleted_mail_tasks = self.items_db.execute_update(
+                    "DELETE FROM mail_tasks WHERE task_id = ?", (self.task_id,)
                 )
-                if existing_mail_tasks_count > 0:
+                if deleted_mail_tasks > 0:
                     self.logger.info(
-                        "既存のメールタスクを削除します",
+                        "既存のメールタスクを削除しました",
                         task_id=self.task_id,
-                        count=existing_mail_tasks_count,
-                    )
-                    self.items_db.execute_update(
-                        "DELETE FROM mail_tasks WHERE task_id = ?", (self.task_id,)
+                        count=deleted_mail_tasks,
                     )
 
                 # task_progressが存在する場合は削除
@@ -425,17 +550,8 @@ class OutlookExtractionService:
                 # OutlookItemModelを使用して対象メールの基本情報のみを取得
                 outlook_item_model = OutlookItemModel()
 
-                # 日付形式を変換（共通関数を使用）
-                start_date_formatted = self._format_outlook_date_filter(start_date)
-                end_date_formatted = self._format_outlook_date_filter(end_date)
-
-                # ジェネレータからすべてのチャンクを取得してリストに結合
-                mail_items_basic = []
-                for chunk in outlook_item_model.get_mail_items(
-                    from_folder_id,
-                    filter_criteria=f"[ReceivedTime] >= '{start_date_formatted}' AND [ReceivedTime] <= '{end_date_formatted}'",
-                ):
-                    mail_items_basic.extend(chunk)
+                # Outlookのフィルター形式に変換
+                date_filter = self._build_date_filter(start_date, end_date)
 
                 # 抽出条件を記録
                 current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -464,46 +580,49 @@ class OutlookExtractionService:
                 )
 
                 # mail_tasksテーブルに各メールアイテムの抽出計画を記録
-                current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-                mail_tasks_query = """
-                INSERT INTO mail_tasks (
-                    task_id, message_id, subject, sent_time,
-                    status, mail_fetch_status, attachment_status,
-                    ai_review_status, created_at
-                ) VALUES (?, ?, ?, ?, 'pending', 'pending', 'pending', 'pending', ?)
-                """
-
-                for mail_item in mail_items_basic:
-                    # 日時データを取得して変換
-                    sent_time = get_safe(mail_item, "SentOn") or get_safe(
-                        mail_item, "ReceivedTime"
-                    )
-
-                    # 共通関数を使用して日時を文字列に変換
-                    sent_time_str = self._format_date_string(sent_time)
-
-                    # 無効なUnicode文字（サロゲートペア）を含む件名をクリーニング
-                    subject = get_safe(mail_item, "Subject")
-                    cleaned_subject = self._clean_unicode_text(subject)
+                # ジェネレータのチャンクごとに一括挿入し、全件をリストに保持しない
+                total_mail_items = 0
+                for chunk in outlook_item_model.get_mail_items(
+                    from_folder_id,
+                    filter_criteria=date_filter,
+                    fields=_PLAN_MAIL_ITEM_FIELDS,
+                ):
+                    # チャンクは列形式のため、必要な列だけを並べて走査する
+                    mail_task_rows = []
+                    for entry_id, subject, received_time in zip(
+                        chunk["EntryID"], chunk["Subject"], chunk["ReceivedTime"]
+                    ):
+                        # 日時データを変換（get_mail_itemsはSentOnを取得しないため受信日時を使う）
+                        sent_time_str = self._format_date_string(received_time)
+
+                        # 無効なUnicode文字（サロゲートペア）を含む件名をクリーニング
+                        cleaned_subject = self._clean_unicode_text(subject)
+
+                        # サロゲートペア文字が削除された場合にログに記録
+                        if subject != cleaned_subject:
+                            self.logger.info(
+                                "件名から無効なUnicode文字を削除しました",
+                                task_id=self.task_id,
+                                subject=subject,
+                                cleaned_subject=cleaned_subject,
+                            )
 
-                    # サロゲートペア文字が削除された場合にログに記録
-                    if subject != cleaned_subject:
-                        self.logger.info(
-                            f"件名から無効なUnicode文字を削除しました: {subject} -> {cleaned_subject}",
-                            task_id=self.task_id,
+                        mail_task_rows.append(
+                            (
+                                self.task_id,
+                                entry_id,
+                                cleaned_subject,
+                                sent_time_str,
+                                current_time,
+                            )
                         )
 
-                    self.items_db.execute_update(
-                        mail_tasks_query,
-                        (
-                            self.task_id,
-                            get_safe(mail_item, "EntryID"),
-                            cleaned_subject,
-                            sent_time_str,
-                            current_time,
-                        ),
-                    )
+                    # 同一の準備済みステートメントでチャンク単位に一括挿入する
+                    if mail_task_rows:
+                        self.items_db.execute_many(
+                            _SQL_INSERT_MAIL_TASK, mail_task_rows
+                        )
+                        total_mail_items += len(mail_task_rows)
 
                 # task_progressテーブルに明示的に進捗状況を記録（初期状態）
                 current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -518,7 +637,7 @@ class OutlookExtractionService:
                 """
                 self.items_db.execute_update(
                     task_progress_query,
-                    (self.task_id, len(mail_items_basic), current_time),
+                    (self.task_id, total_mail_items, current_time),
                 )
 
                 # トランザクションをコミット
@@ -527,7 +646,7 @@ class OutlookExtractionService:
                 self.logger.info(
                     "抽出計画作成成功",
                     task_id=self.task_id,
-                    total_messages=len(mail_items_basic),
+                    total_messages=total_mail_items,
                     from_folder=from_folder_name,
                     to_folder=to_folder_name,
                     start_date=start_date,
@@ -550,9 +669,7 @@ class OutlookExtractionService:
             # スナップショットの存在を確認
             snapshot_exists = False
             try:
-                snapshot_count_query = "SELECT COUNT(*) as count FROM outlook_snapshot"
-                snapshot_result = self.items_db.execute_query(snapshot_count_query)
-                if snapshot_result and snapshot_result[0].get("count", 0) > 0:
+                if self.items_db.get_single_value(_SQL_SNAPSHOT_EXISTS):
                     snapshot_exists = True
                     self.logger.info("既存のOutlookスナップショットを検出しました")
             except Exception as e:
@@ -593,12 +710,11 @@ class OutlookExtractionService:
             chunk_size = item_model._calculate_chunk_size()
 
             # メールタスクをチャンク処理するための準備
-            mail_tasks_query = """
-            SELECT id, task_id, message_id 
-            FROM mail_tasks 
-            WHERE task_id = ? AND status = 'pending'
-            """
-            mail_tasks = self.items_db.execute_query(mail_tasks_query, (self.task_id,))
+            # 処理中に同じ行を更新するためカーソルは開いたままにせず、
+            # 必要な2列だけを(id, message_id)のタプルで取得して行ごとの辞書を作らない
+            mail_tasks = self.items_db.execute_query_tuples(
+                _SQL_SELECT_PENDING_MAIL_TASKS, (self.task_id,)
+            )
 
             self.logger.info(f"抽出対象のメールタスク数: {len(mail_tasks)}")
 
@@ -612,6 +728,9 @@ class OutlookExtractionService:
                 update_task_status_query, (current_time, current_time, self.task_id)
             )
 
+            # Outlookからの取得とDBへの保存を並行させる書き込みスレッドを開始
+            self._start_mail_writer()
+
             # チャンク処理
             for i in range(0, len(mail_tasks), chunk_size):
                 chunk = mail_tasks[i : i + chunk_size]
@@ -619,20 +738,19 @@ class OutlookExtractionService:
                     f"チャンク処理開始: {i+1}～{i+len(chunk)}/{len(mail_tasks)}"
                 )
 
-                # チャンク内のメールをOutlookから取得して保存
-                for task in chunk:
-                    # タスクステータスを処理中に更新
-                    self._update_mail_task_status(
-                        get_safe(task, "id"),
-                        "processing",
-                        mail_fetch_status="processing",
-                    )
+                # チャンク内のタスクステータスをまとめて処理中に更新（コミットはチャンクごとに1回）
+                current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self.items_db.execute_many(
+                    _SQL_MARK_MAIL_TASK_PROCESSING,
+                    [(current_time, mail_task_id) for mail_task_id, _ in chunk],
+                )
 
+                # チャンク内のメールをOutlookから取得して保存
+                for mail_task_id, mail_id in chunk:
                     # メール本体を取得
-                    mail_id = get_safe(task, "message_id")
-                    if not self._process_mail_item(mail_id):
+                    if not self._process_mail_item(mail_id, mail_task_id, conditions):
                         self._update_mail_task_status(
-                            get_safe(task, "id"),
+                            mail_task_id,
                             "error",
                             error_message="メール処理に失敗しました",
                             mail_fetch_status="error",
@@ -643,6 +761,9 @@ class OutlookExtractionService:
                 )
                 time.sleep(0.05)  # チャンクごとにCPUを明け渡す
 
+            # 保存待ちのメールをすべて書き込んでから後続処理に進む
+            self._stop_mail_writer()
+
             # 添付ファイル処理
             if conditions.get("file_download", False):
                 self._process_all_attachments()
@@ -659,6 +780,7 @@ class OutlookExtractionService:
             return True
 
         except Exception as e:
+            self._stop_mail_writer()
             self.logger.error("抽出作業の実行に失敗", error=str(e))
             # タスク状態を失敗に更新
             self._update_extraction_status("error", f"抽出作業の実行に失敗: {str(e)}")
@@ -954,12 +1076,137 @@ class OutlookExtractionService:
             self.logger.error(f"AIレビュー一括処理エラー: {str(e)}")
             return False
 
-    def _process_mail_item(self, entry_id: str) -> bool:
+    def _start_mail_writer(self) -> None:
+        """メール保存用の書き込みスレッドを開始する"""
+        self._write_queue = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+        self._writer_thread = threading.Thread(
+            target=self._mail_writer_loop, args=(self._write_queue,), daemon=True
+        )
+        self._writer_thread.start()
+
+    def _stop_mail_writer(self) -> None:
+        """書き込みスレッドに終了を通知し、保存待ちのメールがなくなるまで待機する"""
+        if self._write_queue is None:
+            return
+
+        self._put_to_writer(None)
+        self._writer_thread.join()
+
+        # 書き込みスレッドが異常終了していた場合は、残ったメールをこのスレッドで保存する
+        remaining = []
+        while True:
+            try:
+                item = self._write_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                remaining.append(item)
+        if remaining:
+            self._save_mail_batch(remaining)
+
+        self._write_queue = None
+        self._writer_thread = None
+
+    def _put_to_writer(self, item: Optional[Tuple[int, dict]]) -> bool:
+        """
+        書き込みスレッドの待ち行列に追加する
+
+        書き込みスレッドが終了していると待ち行列が空かないため、
+        一定間隔で生存を確認しながら待つ
+
+        Args:
+            item: (メールタスクID, メールデータ)、または終了通知のNone
+
+        Returns:
+            bool: 追加できた場合はTrue（書き込みスレッドが終了している場合はFalse）
+        """
+        while self._writer_thread.is_alive():
+            try:
+                self._write_queue.put(item, timeout=_WRITE_QUEUE_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _mail_writer_loop(self, write_queue: queue.Queue) -> None:
+        """
+        待ち行列のメールを順にitems.dbへ保存する（書き込みスレッド）
+
+        Args:
+            write_queue: (メールタスクID, メールデータ)の待ち行列（Noneで終了）
+        """
+        try:
+            stopped = False
+            while not stopped:
+                item = write_queue.get()
+                if item is None:
+                    break
+
+                # 待たずに取り出せる分をまとめ、1回のトランザクションで保存する
+                batch = [item]
+                while len(batch) < _WRITE_QUEUE_SIZE:
+                    try:
+                        item = write_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopped = True
+                        break
+                    batch.append(item)
+
+                self._save_mail_batch(batch)
+        except Exception as e:
+            self.logger.error(f"メール保存スレッドでエラーが発生: {str(e)}")
+        finally:
+            # このスレッドで開いた接続を閉じる
+            self.items_db.disconnect()
+
+    def _save_mail_batch(self, batch: List[Tuple[int, dict]]) -> None:
+        """
+        複数のメールを1回のトランザクションで保存する（書き込みスレッド）
+
+        Args:
+            batch: (メールタスクID, メールデータ)のリスト
+        """
+        failed_task_ids = []
+        if not self.items_db.begin_immediate():
+            # 自動コミットのまま保存すると途中の失敗を巻き戻せないため、すべて失敗とする
+            self.logger.error("メールの一括保存を開始できません", count=len(batch))
+            failed_task_ids = [mail_task_id for mail_task_id, _ in batch]
+        else:
+            try:
+                for mail_task_id, mail_data in batch:
+                    if not self._save_mail_item(mail_data, in_batch=True):
+                        failed_task_ids.append(mail_task_id)
+                self.items_db.commit()
+            except Exception as e:
+                self.items_db.rollback()
+                self.logger.error(
+                    "メールの一括保存に失敗", error=str(e), count=len(batch)
+                )
+                failed_task_ids = [mail_task_id for mail_task_id, _ in batch]
+
+        for mail_task_id in failed_task_ids:
+            self._update_mail_task_status(
+                mail_task_id,
+                "error",
+                error_message="メール処理に失敗しました",
+                mail_fetch_status="error",
+            )
+
+    def _process_mail_item(
+        self, entry_id: str, mail_task_id: int = None, conditions: dict = None
+    ) -> bool:
         """
         メールアイテムの処理
 
+        書き込みスレッドが動作中で添付ファイルの処理が不要な場合、
+        メールの保存は書き込みスレッドに任せて次のメールの取得に進む
+
         Args:
             entry_id: メールのEntryID
+            mail_task_id: メールタスクID（書き込みスレッドでの保存失敗時の更新に使用）
+            conditions: 抽出条件（start_extractionで取得済みのもの。省略時は取得する）
 
         Returns:
             bool: 処理が成功したかどうか
@@ -975,19 +1222,31 @@ class OutlookExtractionService:
             if not mail_data:
                 return False
 
-            # メールアイテムの保存
-            if not self._save_mail_item(mail_data):
+            # 抽出条件は抽出中に変わらないため、呼び出し元で取得済みのものを使う
+            if conditions is None:
+                conditions = self.get_extraction_conditions()
+            if not conditions:
                 return False
 
-            # 抽出条件を一度だけ取得
-            conditions = self.get_extraction_conditions()
-            if not conditions:
+            needs_attachments = conditions.get(
+                "file_download", False
+            ) and mail_data.get("has_attachments", False)
+
+            # 添付ファイルの処理がない場合は書き込みスレッドで保存する
+            # （書き込みスレッドが終了している場合はこのスレッドで保存する）
+            if (
+                self._write_queue is not None
+                and not needs_attachments
+                and self._put_to_writer((mail_task_id, mail_data))
+            ):
+                return True
+
+            # メールアイテムの保存
+            if not self._save_mail_item(mail_data):
                 return False
 
             # 添付ファイルの処理 - mail_dataのhas_attachmentsが真の場合のみ処理
-            if conditions.get("file_download", False) and mail_data.get(
-                "has_attachments", False
-            ):
+            if needs_attachments:
                 if not self._process_attachment_for_mail(
                     mail_data, conditions.get("exclude_extensions", "")
                 ):
@@ -1028,22 +1287,14 @@ class OutlookExtractionService:
                 return False
 
             # 添付ファイル保存先ディレクトリを絶対パスで作成
-            app_root = os.path.abspath(
-                os.path.dirname(
-                    os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-                )
-            )
-            save_dir = os.path.abspath(
-                os.path.join(app_root, "data", "tasks", self.task_id, "attachments")
-            )
+            save_dir = os.path.join(_TASKS_ROOT, self.task_id, "attachments")
             os.makedirs(save_dir, exist_ok=True)
             self.logger.info(
                 f"添付ファイル保存先ディレクトリを作成しました: {save_dir} (絶対パス)"
             )
 
             # OutlookServiceを使用してメールアイテムを取得
-            outlook_service = OutlookService()
-            mail_item = outlook_service.get_item_by_id(mail_id)
+            mail_item = self._get_outlook_service().get_item_by_id(mail_id)
 
             if not mail_item:
                 self.logger.error(f"メールアイテムの取得に失敗: {mail_id}")
@@ -1065,6 +1316,13 @@ class OutlookExtractionService:
                 f"添付ファイル処理: {attachments.Count}個の添付ファイルを処理します"
             )
 
+            # 除外拡張子は添付ファイルごとに分解せず、ループの前に一度だけ集合にする
+            excluded = (
+                {ext.strip().lower() for ext in exclude_extensions.split(",")}
+                if exclude_extensions
+                else set()
+            )
+
             for j in range(1, attachments.Count + 1):  # Outlookのインデックスは1始まり
                 try:
                     attachment = attachments.Item(j)
@@ -1072,11 +1330,9 @@ class OutlookExtractionService:
                     self.logger.info(f"添付ファイル処理中: {file_name}")
 
                     # 除外拡張子のチェック
-                    if exclude_extensions:
+                    if excluded:
                         extension = os.path.splitext(file_name)[1].lower()
-                        if extension and extension[1:] in [
-                            ext.strip().lower() for ext in exclude_extensions.split(",")
-                        ]:
+                        if extension and extension[1:] in excluded:
                             self.logger.info(
                                 f"除外拡張子のため保存をスキップ: {file_name}"
                             )
@@ -1089,12 +1345,6 @@ class OutlookExtractionService:
                     self.logger.info(f"添付ファイルの保存パス: {file_path}")
                     self.logger.info(f"パスの長さ: {len(file_path)}文字")
 
-                    # 確実にディレクトリが存在することを再確認
-                    dir_path = os.path.dirname(file_path)
-                    if not os.path.exists(dir_path):
-                        self.logger.info(f"ディレクトリを作成します: {dir_path}")
-                        os.makedirs(dir_path, exist_ok=True)
-
                     # 拡張子を取得
                     extension = os.path.splitext(file_name)[1].lower()
                     is_msg_file = extension == ".msg"
@@ -1198,8 +1448,10 @@ class OutlookExtractionService:
                         try:
                             # MSG形式のファイルを一時的な場所からOutlookアイテムとして読み込む
                             try:
-                                msg_item = outlook_service.get_item_from_msg(
-                                    temp_msg_path
+                                msg_item = (
+                                    self._get_outlook_service().get_item_from_msg(
+                                        temp_msg_path
+                                    )
                                 )
                                 self.logger.info(
                                     f"MSGファイルをOutlookアイテムとして読み込みました"
@@ -1495,8 +1747,7 @@ class OutlookExtractionService:
         """
         try:
             # OutlookServiceを使用してメールアイテムを取得
-            outlook_service = OutlookService()
-            mail_item = outlook_service.get_item_by_id(entry_id)
+            mail_item = self._get_outlook_service().get_item_by_id(entry_id)
 
             if not mail_item:
                 self.logger.error(f"メールアイテムの取得に失敗: {entry_id}")
@@ -1619,12 +1870,14 @@ class OutlookExtractionService:
             self.logger.error(f"メールタイプの更新処理でエラーが発生: {str(e)}")
             return "email"  # エラー時はデフォルト値を返す
 
-    def _save_mail_item(self, mail_data: dict) -> bool:
+    def _save_mail_item(self, mail_data: dict, in_batch: bool = False) -> bool:
         """
         メールアイテムの保存
 
         Args:
             mail_data: 保存するメールのデータ
+            in_batch: 呼び出し元のトランザクション内で保存するかどうか
+                （Trueの場合はコミットせず、セーブポイントで1件分だけを巻き戻せるようにする）
 
         Returns:
             bool: 保存が成功したかどうか
@@ -1673,8 +1926,15 @@ class OutlookExtractionService:
             #         # 変換エラーの場合はMarkdownとして処理しない
             #         markdown_content = ""
 
-            # トランザクション開始
-            self.items_db.begin_transaction()
+            # トランザクション開始（書き込みスレッドと競合しないよう書き込みロックを先に取得）
+            if in_batch:
+                self.items_db.execute_update(_SQL_SAVEPOINT_MAIL)
+            elif not self.items_db.begin_immediate():
+                # 自動コミットのまま保存すると途中の失敗を巻き戻せないため失敗とする
+                self.logger.error(
+                    f"メールデータ保存のトランザクションを開始できません: {mail_data['entry_id']}"
+                )
+                return False
 
             try:
                 # まず参加者情報を保存
@@ -1682,18 +1942,6 @@ class OutlookExtractionService:
                     mail_data["entry_id"], mail_data["participants"]
                 )
 
-                # mail_itemsテーブルにメールデータを保存
-                query = """
-                INSERT INTO mail_items (
-                    entry_id, store_id, folder_id, conversation_id, conversation_index, thread_id,
-                    message_type, subject, sent_time, received_time,
-                    body, unread, message_size, task_id, has_attachments, attachment_count, processed_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-                """
-
-                # 現在の時刻を取得
-                current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
                 # 添付ファイルの個数を取得 - raw_itemは使用せず、直接mail_dataから取得
                 attachment_count = mail_data.get("attachment_count", 0)
 
@@ -1718,8 +1966,8 @@ class OutlookExtractionService:
                     attachment_count,  # 添付ファイルの個数
                 ]
 
-                # メールデータを保存
-                self.items_db.execute_update(query, tuple(params))
+                # mail_itemsテーブルにメールデータを保存
+                self.items_db.execute_update(_SQL_INSERT_MAIL_ITEM, tuple(params))
 
                 # Markdown化されたHTMLコンテンツをstyled_bodyテーブルに保存（一時的に無効化）
                 # if markdown_content:
@@ -1739,26 +1987,17 @@ class OutlookExtractionService:
                 #     self.items_db.execute_update(styled_body_query, styled_body_params)
                 #     self.logger.info(f"Markdown化されたコンテンツをstyled_bodyテーブルに保存しました: {mail_data['subject']}")
 
-                # mail_tasksテーブルの状態を更新
-                # message_idからtask idを取得
-                task_query = """
-                SELECT id FROM mail_tasks
-                WHERE message_id = ? AND task_id = ?
-                """
-                task_result = self.items_db.execute_query(
-                    task_query, (mail_data["entry_id"], self.task_id)
+                # mail_tasksテーブルのstatusとmail_fetch_statusを更新
+                # （IDの取得を挟まず、task_idとmessage_idで直接更新する）
+                self.items_db.execute_update(
+                    _SQL_MARK_MAIL_TASK_FETCHED, (self.task_id, mail_data["entry_id"])
                 )
 
-                if task_result:
-                    task_id = task_result[0]["id"]
-
-                    # タスクのstatusとmail_fetch_statusを更新
-                    self._update_mail_task_status(
-                        task_id, "processing", mail_fetch_status="success"
-                    )
-
-                # コミット
-                self.items_db.commit()
+                # コミット（まとめて保存する場合はセーブポイントの解放のみ）
+                if in_batch:
+                    self.items_db.execute_update(_SQL_RELEASE_MAIL)
+                else:
+                    self.items_db.commit()
                 self.logger.info(
                     f"メールデータをDBに保存しました: {mail_data['subject']}"
                 )
@@ -1766,7 +2005,11 @@ class OutlookExtractionService:
 
             except Exception as e:
                 # ロールバック
-                self.items_db.rollback()
+                if in_batch:
+                    self.items_db.execute_update(_SQL_ROLLBACK_TO_MAIL)
+                    self.items_db.execute_update(_SQL_RELEASE_MAIL)
+                else:
+                    self.items_db.rollback()
                 self.logger.error(f"メールデータ保存中のSQLエラー: {str(e)}")
                 raise e
 
@@ -1791,34 +2034,22 @@ class OutlookExtractionService:
             # 現在時刻
             current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            # 送信者の処理
-            for sender in participants.get("sender", []):
-                if not sender.get("email"):
-                    continue
-
-                # ユーザー情報の保存/更新
-                user_id = self._save_user_info(sender, current_time)
-                if user_id:
-                    # participantsテーブルに関連を保存
-                    self._save_participant_relation(
-                        mail_id, user_id, "sender", current_time
-                    )
-                    participant_ids["sender"].append(user_id)
-
-            # 受信者の処理
-            for recipient_type in ["to", "cc", "bcc"]:
-                for recipient in participants.get(recipient_type, []):
-                    if not recipient.get("email"):
+            # 送信者・受信者の順にユーザー情報を保存/更新し、関連行を収集
+            relation_rows = []
+            for participant_type in ["sender", "to", "cc", "bcc"]:
+                for participant in participants.get(participant_type, []):
+                    if not participant.get("email"):
                         continue
 
                     # ユーザー情報の保存/更新
-                    user_id = self._save_user_info(recipient, current_time)
+                    user_id = self._save_user_info(participant, current_time)
                     if user_id:
-                        # participantsテーブルに関連を保存
-                        self._save_participant_relation(
-                            mail_id, user_id, recipient_type, current_time
-                        )
-                        participant_ids[recipient_type].append(user_id)
+                        relation_rows.append((mail_id, user_id, participant_type))
+                        participant_ids[participant_type].append(user_id)
+
+            # participantsテーブルに関連を一括保存（既存の関連はUNIQUE制約で無視）
+            if relation_rows:
+                self.items_db.execute_many(_SQL_INSERT_PARTICIPANT, relation_rows)
 
             return participant_ids
 
@@ -1916,49 +2147,6 @@ class OutlookExtractionService:
             self.logger.error(f"ユーザー情報の保存に失敗: {str(e)}")
             return None
 
-    def _save_participant_relation(
-        self, mail_id: str, user_id: int, participant_type: str, timestamp: str
-    ) -> bool:
-        """
-        メールと参加者の関連を保存する
-
-        Args:
-            mail_id: メールID
-            user_id: ユーザーID
-            participant_type: 参加者タイプ (sender, to, cc, bcc)
-            timestamp: タイムスタンプ
-
-        Returns:
-            bool: 保存が成功したかどうか
-        """
-        try:
-            # 既存の関連をチェック
-            check_query = """
-            SELECT id FROM participants 
-            WHERE mail_id = ? AND user_id = ? AND participant_type = ?
-            """
-            result = self.items_db.execute_query(
-                check_query, (mail_id, user_id, participant_type)
-            )
-
-            if not result:
-                # 新規関連の保存
-                insert_query = """
-                INSERT INTO participants (
-                    mail_id, user_id, participant_type, address_type
-                ) VALUES (?, ?, ?, 'SMTP')
-                """
-
-                self.items_db.execute_update(
-                    insert_query, (mail_id, user_id, participant_type)
-                )
-
-            return True
-
-        except Exception as e:
-            self.logger.error(f"参加者関連の保存に失敗: {str(e)}")
-            return False
-
     def _process_ai_review(self, mail_id: str, mode: str = "thread") -> bool:
         """
         AIレビューの処理
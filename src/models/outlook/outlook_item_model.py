@@ -14,12 +14,24 @@ Outlookメールアイテム管理モデル
 - get_participants: 参加者情報の取得
 """
 
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
 from src.models.outlook.outlook_base_model import OutlookBaseModel
 from src.models.outlook.outlook_service import OutlookService
 from src.util.object_util import debug_print_mail_item, get_safe
 
+# get_mail_itemsで取得するメールアイテムのプロパティと既定値
+_MAIL_ITEM_FIELDS = (
+    ("EntryID", None),
+    ("Subject", None),
+    ("ReceivedTime", None),
+    ("SenderName", None),
+    ("UnRead", False),
+    ("HasAttachments", False),
+    ("Size", 0),
+    ("Categories", ""),
+)
+
 
 class OutlookItemModel(OutlookBaseModel):
     """Outlookメールアイテム管理モデル"""
@@ -34,17 +46,23 @@ class OutlookItemModel(OutlookBaseModel):
         folder_id: str,
         filter_criteria: Optional[str] = None,
         chunk_size: Optional[int] = None,
-    ) -> Generator[List[Dict[str, Any]], None, None]:
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> Generator[Dict[str, List[Any]], None, None]:
         """
         指定したフォルダのメールアイテムを取得する
 
+        メールごとに辞書を作らず、プロパティ名ごとの値のリスト（列形式）で返す
+        （i番目のメールの件名は chunk["Subject"][i]）
+
         Args:
             folder_id: フォルダID
             filter_criteria: フィルタ条件
             chunk_size: バッチ処理のチャンクサイズ（指定がない場合は自動計算）
+            fields: 取得するプロパティ名（指定がない場合は_MAIL_ITEM_FIELDSのすべて）
+                プロパティの参照はCOM呼び出しになるため、必要なものだけを指定する
 
         Yields:
-            List[Dict[str, Any]]: メールアイテムのリスト（チャンク単位）
+            Dict[str, List[Any]]: プロパティ名ごとの値のリスト（チャンク単位）
         """
         # チャンクサイズの決定
         if chunk_size is None:
@@ -53,6 +71,15 @@ class OutlookItemModel(OutlookBaseModel):
                 self._chunk_size = 20
             chunk_size = self._chunk_size
 
+        # 取得するプロパティを絞り込む
+        selected_fields = (
+            _MAIL_ITEM_FIELDS
+            if fields is None
+            else tuple(
+                (name, default) for name, default in _MAIL_ITEM_FIELDS if name in fields
+            )
+        )
+
         self.logger.info(
             "メールアイテムを取得します",
             folder_id=folder_id,
@@ -72,36 +99,30 @@ class OutlookItemModel(OutlookBaseModel):
                 mail_items = mail_items.Restrict(filter_criteria)
 
             # メールアイテムをチャンクごとに処理
-            current_chunk = []
+            current_chunk = {name: [] for name, _ in selected_fields}
+            chunk_count = 0
             total_processed = 0
 
             for item in mail_items:
-                mail_data = {
-                    "EntryID": get_safe(item, "EntryID"),
-                    "Subject": get_safe(item, "Subject"),
-                    "ReceivedTime": get_safe(item, "ReceivedTime"),
-                    "SenderName": get_safe(item, "SenderName"),
-                    "UnRead": get_safe(item, "UnRead", False),
-                    "HasAttachments": get_safe(item, "HasAttachments", False),
-                    "Size": get_safe(item, "Size", 0),
-                    "Categories": get_safe(item, "Categories", ""),
-                }
-                current_chunk.append(mail_data)
+                for name, default in selected_fields:
+                    current_chunk[name].append(get_safe(item, name, default))
+                chunk_count += 1
 
                 # チャンクサイズに達したらyield
-                if len(current_chunk) >= chunk_size:
-                    total_processed += len(current_chunk)
+                if chunk_count >= chunk_size:
+                    total_processed += chunk_count
                     self.logger.info(
-                        f"チャンクを取得しました: {len(current_chunk)}件 (合計: {total_processed}件)"
+                        f"チャンクを取得しました: {chunk_count}件 (合計: {total_processed}件)"
                     )
                     yield current_chunk
-                    current_chunk = []
+                    current_chunk = {name: [] for name, _ in selected_fields}
+                    chunk_count = 0
 
             # 残りのアイテムをyield
-            if current_chunk:
-                total_processed += len(current_chunk)
+            if chunk_count:
+                total_processed += chunk_count
                 self.logger.info(
-                    f"最後のチャンクを取得しました: {len(current_chunk)}件 (合計: {total_processed}件)"
+                    f"最後のチャンクを取得しました: {chunk_count}件 (合計: {total_processed}件)"
                 )
                 yield current_chunk
 
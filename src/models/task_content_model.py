@@ -7,7 +7,7 @@ import os
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from src.core.database import DatabaseManager
+from src.core.database import get_db
 from src.core.logger import get_logger
 from src.util.object_util import get_safe
 
@@ -18,8 +18,9 @@ class TaskContentModel:
     def __init__(self):
         """初期化"""
         self.logger = get_logger()
-        self._tasks_db = DatabaseManager("data/tasks.db")
-        self._outlook_db = DatabaseManager("data/outlook.db")
+        # 他のモデルと共有する接続を使う（接続とPRAGMA設定を使い回す）
+        self._tasks_db = get_db("data/tasks.db")
+        self._outlook_db = get_db("data/outlook.db")
 
     def create_task(self, task_info: Dict[str, Any]) -> bool:
         """タスクを作成"""
@@ -139,18 +140,14 @@ class TaskContentModel:
             # タスクフォルダのパスを設定
             task_dir = os.path.join("data", "tasks", str(task_id))
 
-            # フォルダが存在しない場合のみ作成
-            if not os.path.exists(task_dir):
-                os.makedirs(task_dir)
-                self.logger.info(
-                    f"TaskContentModel: タスクフォルダを作成しました - {task_dir}"
-                )
+            # フォルダを作成（既に存在する場合はそのまま使用）
+            os.makedirs(task_dir, exist_ok=True)
 
             # items.dbのパスを設定
             items_db_path = os.path.join(task_dir, "items.db")
 
             # items.dbが存在しない場合のみ作成
-            if not os.path.exists(items_db_path):
+            if not os.path.isfile(items_db_path):
                 from src.core.database import DatabaseManager
 
                 db_manager = DatabaseManager(items_db_path)
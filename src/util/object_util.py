@@ -25,10 +25,9 @@ def get_safe(
             return obj.get(property_name, default_value)
 
         # オブジェクトの場合
-        if not hasattr(obj, property_name):
-            return default_value
-
-        value = getattr(obj, property_name)
+        # hasattrで確認してから取得するとCOMオブジェクトでは呼び出しが2回になるため、
+        # 既定値付きのgetattrで1回だけ参照する（存在しない場合はNone）
+        value = getattr(obj, property_name, None)
         return value if value is not None else default_value
     except Exception as e:
         logger.warning(f"プロパティ '{property_name}' の取得に失敗しました: {str(e)}")
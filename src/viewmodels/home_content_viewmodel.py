@@ -1,8 +1,8 @@
 import asyncio
 import os
-from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple
+from typing import Any, AsyncGenerator, Callable, Dict, List, Tuple
 
-from src.core.database import DatabaseManager
+from src.core.database import get_db
 from src.core.logger import get_logger
 from src.models.home_content_model import HomeContentModel
 from src.views.components.progress_dialog import ProgressDialog
@@ -447,8 +447,10 @@ class HomeContentViewModel:
 
                 await asyncio.sleep(0.1)
 
-                # スナップショットを作成
-                snapshot_success = self.model.create_outlook_snapshot(task_id)
+                # スナップショットを作成（COMの処理でUIが固まらないよう、別スレッドで実行する）
+                snapshot_success = await self.model.create_outlook_snapshot_async(
+                    task_id
+                )
                 if not snapshot_success:
                     self.logger.error(
                         "HomeContentViewModel: スナップショットの作成に失敗しました",
@@ -470,8 +472,8 @@ class HomeContentViewModel:
 
             await asyncio.sleep(0.1)
 
-            # メール抽出を開始
-            result = self.model.start_mail_extraction(task_id)
+            # メール抽出を開始（COMの処理でUIが固まらないよう、別スレッドで実行する）
+            result = await self.model.start_mail_extraction_async(task_id)
 
             # 結果に応じてログを出力
             if result:
@@ -637,8 +639,8 @@ class HomeContentViewModel:
                 items_db_path = os.path.join("data", "tasks", str(task_id), "items.db")
 
                 if os.path.exists(items_db_path):
-                    # DatabaseManagerを使用してデータベースに接続
-                    items_db = DatabaseManager(items_db_path)
+                    # 共有の接続を再利用する（タスク削除時にrelease_dbで閉じられる）
+                    items_db = get_db(items_db_path)
 
                     # task_progressテーブルから最新の状態を取得
                     progress_query = """
@@ -661,9 +663,6 @@ class HomeContentViewModel:
                             task_id=task_id,
                             status=task_status,
                         )
-
-                    # データベース接続を閉じる
-                    items_db.disconnect()
             except Exception as e:
                 self.logger.error(
                     "HomeContentViewModel: タスク状態取得中にエラー発生",
@@ -691,7 +690,6 @@ class HomeContentViewModel:
         Returns:
             bool: 抽出が完了しているかどうか
         """
-        items_db = None
         try:
             # 抽出状態を確認
             status = self.check_snapshot_and_extraction_plan(task_id)
@@ -712,8 +710,8 @@ class HomeContentViewModel:
                 )
                 return False
 
-            # DatabaseManagerを直接使用
-            items_db = DatabaseManager(items_db_path)
+            # 共有の接続を再利用する（ポーリングのたびに接続を開き直さない）
+            items_db = get_db(items_db_path)
 
             # task_progressテーブルから最新の状態を取得
             progress_query = """
@@ -784,10 +782,6 @@ class HomeContentViewModel:
                 error=str(e),
             )
             return False
-        finally:
-            # データベース接続が閉じられていることを確認
-            if items_db:
-                items_db.disconnect()
 
     async def _check_extraction_status_from_db(
         self, task_id: str, with_progress: bool = False
@@ -802,7 +796,6 @@ class HomeContentViewModel:
         Returns:
             Tuple[bool, Dict[str, Any]]: 抽出が完了しているかどうかと進捗情報
         """
-        items_db = None
         try:
             # データベース接続が必要なため、モデルに処理を委譲
             items_db_path = os.path.join("data", "tasks", str(task_id), "items.db")
@@ -814,8 +807,8 @@ class HomeContentViewModel:
                 )
                 return False, {}
 
-            # DatabaseManagerを直接使用
-            items_db = DatabaseManager(items_db_path)
+            # 共有の接続を再利用する（ポーリングのたびに接続を開き直さない）
+            items_db = get_db(items_db_path)
 
             # 進捗情報を格納する辞書
             progress_info = {}
@@ -962,10 +955,6 @@ class HomeContentViewModel:
                 error=str(e),
             )
             return False, {}
-        finally:
-            # データベース接続が閉じられていることを確認
-            if items_db:
-                items_db.disconnect()
 
     async def poll_extraction_progress(
         self, task_id: str, poll_interval: float = 2.0
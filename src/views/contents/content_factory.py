@@ -88,12 +88,21 @@ def create_content(destination_key, contents_viewmodel=None):
     return ContentFactory.create_content(destination_key, contents_viewmodel)
 
 
-def get_current_contents():
+def get_content_by_type(name):
     """
-    現在管理されているコンテンツのリストを取得
+    クラス名を指定して、現在管理されているコンテンツから最初に一致するものを取得
+
+    Args:
+        name (str): コンテンツのクラス名（例: "PreviewContent"）
 
     Returns:
-        list: 現在管理されているコンテンツのリスト
+        Optional[Any]: 該当するコンテンツ。存在しない場合はNone
     """
-    global _current_contents
-    return _current_contents
+    return next(
+        (
+            content
+            for content in _current_contents
+            if content.__class__.__name__ == name
+        ),
+        None,
+    )
@@ -342,6 +342,32 @@ class PreviewContent(ft.Container):
             self.page.floating_action_button = None
             self.page.update()
 
+    def release_for_delete(self) -> bool:
+        """
+        タスク削除前にitems.dbへの参照を解放する
+
+        Returns:
+            bool: ViewModelをクローズした場合True
+        """
+        if not self.viewmodel:
+            return False
+
+        self.viewmodel.close()
+        self.viewmodel = None
+
+        # 会話コンテナとメール表示コンポーネントのリセット
+        self.group_containers.clear()
+        components = [
+            self.mail_list_component,
+            self.mail_content_viewer,
+        ]
+        for component in components:
+            component.reset()
+
+        # タスクIDをクリア
+        self.task_id = None
+        return True
+
     def on_dispose(self):
         """リソース解放時の処理"""
         self.logger.info("PreviewContent: リソース解放")
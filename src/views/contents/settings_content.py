@@ -10,6 +10,14 @@ import flet as ft
 from src.views.components.text_with_subtitle import TextWithSubtitle
 from src.views.styles.style import AppTheme
 
+# 設定テキストを格納するディレクトリ（プロジェクトルート直下のconfig）
+_CONFIG_DIR = os.path.join(
+    os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    ),
+    "config",
+)
+
 
 class SettingsContent(ft.Container):
     """
@@ -34,13 +42,7 @@ class SettingsContent(ft.Container):
 
         def get_config_text(file_name):
             """設定テキストを取得"""
-            config_path = os.path.join(
-                os.path.dirname(
-                    os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-                ),
-                "config",
-                f"{file_name}.txt",
-            )
+            config_path = os.path.join(_CONFIG_DIR, f"{file_name}.txt")
             try:
                 with open(config_path, "r", encoding="utf-8") as file:
                     return file.read()
@@ -50,13 +52,7 @@ class SettingsContent(ft.Container):
 
         def save_keywords(e):
             """keywordsテキストを保存"""
-            config_path = os.path.join(
-                os.path.dirname(
-                    os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-                ),
-                "config",
-                "keywords.txt",
-            )
+            config_path = os.path.join(_CONFIG_DIR, "keywords.txt")
             try:
                 with open(config_path, "w", encoding="utf-8") as file:
                     file.write(e.control.value)
@@ -65,13 +61,7 @@ class SettingsContent(ft.Container):
 
         def save_prompt(e):
             """promptテキストを保存"""
-            config_path = os.path.join(
-                os.path.dirname(
-                    os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-                ),
-                "config",
-                "prompt.txt",
-            )
+            config_path = os.path.join(_CONFIG_DIR, "prompt.txt")
             try:
                 with open(config_path, "w", encoding="utf-8") as file:
                     file.write(e.control.value)
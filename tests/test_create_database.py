@@ -1,8 +1,10 @@
 import datetime
 import os
+import tempfile
+import threading
 from pathlib import Path
 
-from src.core.database import DatabaseManager
+from src.core.database import _DB_POOL_MAX_SIZE, DatabaseManager, get_db, release_db
 
 # プロジェクトのルートディレクトリを取得
 ROOT_DIR = Path(__file__).parent.parent
@@ -114,12 +116,105 @@ def test_create_items_database():
     os.rmdir(archive_dir)
 
 
+def test_connection_uses_wal_mode():
+    """接続時にWALモードが有効になるテスト"""
+    db_file = ROOT_DIR / "data" / "tasks.db"
+
+    db_manager = DatabaseManager(str(db_file))
+
+    rows = db_manager.execute_query("PRAGMA journal_mode")
+    assert rows[0]["journal_mode"] == "wal"
+
+    db_manager.disconnect()
+
+
+def test_get_db_shares_manager_per_path():
+    """同じパスに対してget_dbが同じDatabaseManagerを返すテスト"""
+    db_file = ROOT_DIR / "data" / "tasks.db"
+
+    db_manager = get_db(str(db_file))
+    assert get_db(str(db_file)) is db_manager
+
+    # 解放後は新しいDatabaseManagerが生成される
+    release_db(str(db_file))
+    other = get_db(str(db_file))
+    assert other is not db_manager
+
+    release_db(str(db_file))
+
+
+def test_release_db_lets_holders_reconnect():
+    """release_db後も取得済みのDatabaseManagerが接続し直して使えるテスト"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "sample.db")
+        db_manager = get_db(db_file)
+
+        # 他スレッドでも接続を開いておく
+        worker = threading.Thread(target=db_manager.execute_query, args=("SELECT 1",))
+        worker.start()
+        worker.join()
+
+        release_db(db_file)
+        assert not db_manager._connections
+
+        # 閉じられた接続を使わず、新しく接続し直す
+        assert db_manager.execute_query("SELECT 1 AS value") == [{"value": 1}]
+        db_manager.close_all()
+
+
+def test_release_db_closes_evicted_manager():
+    """上限超過でプールから外れたDatabaseManagerの他スレッドの接続もrelease_dbで閉じるテスト"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "evicted.db")
+        db_manager = get_db(db_file)
+
+        worker = threading.Thread(target=db_manager.execute_query, args=("SELECT 1",))
+        worker.start()
+        worker.join()
+
+        # 他のパスで上限まで埋めて、最初のDatabaseManagerをプールから外す
+        others = [
+            os.path.join(tmp_dir, f"other{i}.db") for i in range(_DB_POOL_MAX_SIZE)
+        ]
+        for other in others:
+            get_db(other)
+        assert get_db(db_file) is not db_manager
+        assert db_manager._connections
+
+        release_db(db_file)
+        assert not db_manager._connections
+
+        for other in others:
+            release_db(other)
+
+
+def test_execute_query_tuples_returns_tuples():
+    """execute_query_tuplesが行をタプルで返すテスト"""
+    db_file = ROOT_DIR / "data" / "tasks.db"
+
+    db_manager = DatabaseManager(str(db_file))
+
+    rows = db_manager.execute_query_tuples("SELECT ?, ?", (1, "a"))
+    assert rows == [(1, "a")]
+
+    # 既存のexecute_queryは引き続き辞書を返す
+    rows = db_manager.execute_query("SELECT 1 AS value")
+    assert rows == [{"value": 1}]
+
+    db_manager.disconnect()
+
+
 # 手動実行用のヘルパー関数
 def run_tests():
     # テスト関数を直接実行
     test_create_outlook_database()
     test_create_tasks_database()
     test_create_items_database()
+    test_connection_uses_wal_mode()
+    test_get_db_shares_manager_per_path()
+    test_release_db_lets_holders_reconnect()
+    test_release_db_closes_evicted_manager()
+    test_execute_query_tuples_returns_tuples()
 
 
 if __name__ == "__main__":
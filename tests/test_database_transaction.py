@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.core.database import DatabaseManager
+
+
+def _create_db(db_file):
+    """テスト用のテーブルを持つデータベースを作成する"""
+    db_manager = DatabaseManager(str(db_file))
+    db_manager.execute_update("CREATE TABLE sample (id INTEGER PRIMARY KEY, name TEXT)")
+    return db_manager
+
+
+def test_rollback_discards_writes_in_transaction(tmp_path):
+    """明示的なトランザクション中の書き込みがロールバックで破棄されるテスト"""
+    db_manager = _create_db(tmp_path / "sample.db")
+
+    assert db_manager.begin_immediate()
+    db_manager.execute_update("INSERT INTO sample (name) VALUES (?)", ("a",))
+    db_manager.execute_many("INSERT INTO sample (name) VALUES (?)", [("b",), ("c",)])
+    assert db_manager.rollback()
+
+    rows = db_manager.execute_query("SELECT COUNT(*) AS count FROM sample")
+    assert rows[0]["count"] == 0
+
+    db_manager.disconnect()
+
+
+def test_commit_persists_writes_in_transaction(tmp_path):
+    """明示的なトランザクション中の書き込みがコミットで確定されるテスト"""
+    db_file = tmp_path / "sample.db"
+    db_manager = _create_db(db_file)
+
+    assert db_manager.begin_immediate()
+    db_manager.execute_many("INSERT INTO sample (name) VALUES (?)", [("a",), ("b",)])
+    assert db_manager.commit()
+
+    # トランザクション終了後は従来どおり自動コミットされる
+    db_manager.execute_update("INSERT INTO sample (name) VALUES (?)", ("c",))
+    db_manager.disconnect()
+
+    other = DatabaseManager(str(db_file))
+    rows = other.execute_query("SELECT COUNT(*) AS count FROM sample")
+    assert rows[0]["count"] == 3
+    other.disconnect()
+
+
+def test_close_all_closes_connections_of_other_threads(tmp_path):
+    """close_allが他スレッドで開かれた接続も閉じるテスト"""
+    db_manager = _create_db(tmp_path / "sample.db")
+
+    worker = threading.Thread(
+        target=db_manager.execute_query, args=("SELECT * FROM sample",)
+    )
+    worker.start()
+    worker.join()
+    assert len(db_manager._connections) == 2
+
+    assert db_manager.close_all()
+    assert not db_manager._connections
+
+
+def test_connection_closed_during_transaction_is_not_reopened(tmp_path):
+    """トランザクション中に他スレッドから閉じられた接続を自動コミットで開き直さないテスト"""
+    db_manager = _create_db(tmp_path / "sample.db")
+
+    assert db_manager.begin_immediate()
+    db_manager.execute_update("INSERT INTO sample (name) VALUES (?)", ("a",))
+
+    closer = threading.Thread(target=db_manager.close_all)
+    closer.start()
+    closer.join()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        db_manager.execute_update("INSERT INTO sample (name) VALUES (?)", ("b",))
+    assert not db_manager.commit()
+
+    # トランザクション終了後は接続し直して使える
+    rows = db_manager.execute_query("SELECT COUNT(*) AS count FROM sample")
+    assert rows[0]["count"] == 0
+
+    db_manager.close_all()
+
+
+# 手動実行用のヘルパー関数
+def run_tests():
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_rollback_discards_writes_in_transaction(Path(tmp_dir) / "rollback")
+        test_commit_persists_writes_in_transaction(Path(tmp_dir) / "commit")
+        test_close_all_closes_connections_of_other_threads(Path(tmp_dir) / "close")
+        test_connection_closed_during_transaction_is_not_reopened(
+            Path(tmp_dir) / "reopen"
+        )
+
+
+if __name__ == "__main__":
+    # 手動実行用
+    run_tests()
+    print("すべてのトランザクションテストが完了しました。")
@@ -0,0 +1,116 @@
+import datetime
+
+import pytest
+
+# OutlookExtractionServiceはpywin32に依存するため、未インストールの環境では実行しない
+pytest.importorskip("win32com.client")
+
+from src.core.database import DatabaseManager
+from src.models.outlook import outlook_extraction_service
+from src.models.outlook.outlook_extraction_service import OutlookExtractionService
+
+
+class _FakeAttachment:
+    """SaveAsFileでダミーの内容を書き出す添付ファイル"""
+
+    def __init__(self, file_name):
+        self.FileName = file_name
+
+    def SaveAsFile(self, path):
+        with open(path, "wb") as f:
+            f.write(b"dummy")
+
+
+class _FakeAttachments:
+    """Outlookと同じく1始まりのインデックスで添付ファイルを返すコレクション"""
+
+    def __init__(self, attachments):
+        self._attachments = attachments
+        self.Count = len(attachments)
+
+    def Item(self, index):
+        return self._attachments[index - 1]
+
+
+class _FakeMsgItem:
+    """.msgファイルから復元したメールアイテム"""
+
+    EntryID = "restored-entry-id"
+    StoreID = "store"
+    ConversationID = "conversation"
+    ConversationIndex = "0" * 44
+    MessageClass = "IPM.Note"
+    Subject = "添付されたメール"
+    Body = "本文"
+    HTMLBody = ""
+    UnRead = 0
+    Size = 100
+    SentOn = datetime.datetime(2025, 1, 1, 9, 0, 0)
+    ReceivedTime = datetime.datetime(2025, 1, 1, 9, 0, 1)
+    Sender = None
+    Recipients = None
+
+
+class _FakeOutlookService:
+    """添付ファイルの処理で使うメソッドだけを持つOutlookService"""
+
+    def __init__(self):
+        self.msg_paths = []
+
+    def get_item_by_id(self, entry_id):
+        mail_item = _FakeMsgItem()
+        mail_item.Attachments = _FakeAttachments([_FakeAttachment("child.msg")])
+        return mail_item
+
+    def get_item_from_msg(self, path):
+        self.msg_paths.append(path)
+        return _FakeMsgItem()
+
+
+def test_msg_attachment_is_restored_as_mail(tmp_path, monkeypatch):
+    """.msg形式の添付ファイルが共有のOutlookServiceでメールとして保存されるテスト"""
+    monkeypatch.setattr(outlook_extraction_service, "OutlookClient", lambda: None)
+    monkeypatch.setattr(
+        outlook_extraction_service, "_TASKS_ROOT", str(tmp_path / "tasks")
+    )
+    items_db = DatabaseManager(str(tmp_path / "items.db"))
+    service = OutlookExtractionService("1", items_db=items_db)
+    outlook_service = _FakeOutlookService()
+    service._outlook_service = outlook_service
+
+    mail_data = {
+        "entry_id": "parent-entry-id",
+        "folder_id": "folder",
+        "subject": "親メール",
+        "has_attachments": True,
+        "attachment_count": 1,
+    }
+    assert service._process_attachment_for_mail(mail_data)
+
+    assert len(outlook_service.msg_paths) == 1
+    rows = items_db.execute_query(
+        "SELECT message_type FROM mail_items WHERE entry_id = ?",
+        (_FakeMsgItem.EntryID,),
+    )
+    assert rows and rows[0]["message_type"] == "msg"
+
+    items_db.close_all()
+
+
+# 手動実行用のヘルパー関数
+def run_tests():
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monkeypatch = pytest.MonkeyPatch()
+        try:
+            test_msg_attachment_is_restored_as_mail(Path(tmp_dir), monkeypatch)
+        finally:
+            monkeypatch.undo()
+
+
+if __name__ == "__main__":
+    # 手動実行用
+    run_tests()
+    print("すべてのOutlookExtractionServiceテストが完了しました。")
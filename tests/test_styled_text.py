@@ -0,0 +1,66 @@
+import re
+
+import pytest
+
+from src.models.mail import styled_text
+
+# 大文字小文字の対応が特殊な非ASCII文字を含む入力
+_CASES = [
+    ("ΟΔΥΣΣΕΥΣ και οδυσσευς", ("σ", "Σευς")),
+    ("Straße STRASSE ſtraße", ("s", "ST")),
+    ("KELVIN Kelvin kelvin", ("k",)),
+    ("İstanbul ISTANBUL ıstanbul", ("ı", "I")),
+    ("Ångström ÅNGSTRÖM", ("å", "ö")),
+]
+
+
+def _split_with_regex(text, target_words):
+    """従来どおりre.IGNORECASEのfinditerで非一致・一致を交互に並べる"""
+    pattern = re.compile("|".join(map(re.escape, target_words)), re.IGNORECASE)
+    parts = []
+    last = 0
+    for match in pattern.finditer(text):
+        parts += (text[last : match.start()], match.group())
+        last = match.end()
+    parts.append(text[last:])
+    return parts
+
+
+def test_split_by_words_matches_regex_on_non_ascii():
+    """Aho-Corasickによる分割が非ASCII文字でも正規表現と同じ結果になるテスト"""
+    if styled_text.ahocorasick is None:
+        pytest.skip("pyahocorasickがインストールされていません")
+
+    for text, target_words in _CASES:
+        assert styled_text._split_by_words(text, target_words) == _split_with_regex(
+            text, target_words
+        )
+
+
+def test_split_by_words_paths_agree(monkeypatch):
+    """検索方法によらず分割結果が同じになるテスト"""
+    expected = [
+        styled_text._split_by_words(text, target_words) for text, target_words in _CASES
+    ]
+
+    monkeypatch.setattr(styled_text, "ahocorasick", None)
+    monkeypatch.setattr(styled_text, "hyperscan", None)
+    assert [
+        styled_text._split_by_words(text, target_words) for text, target_words in _CASES
+    ] == expected
+
+
+# 手動実行用のヘルパー関数
+def run_tests():
+    monkeypatch = pytest.MonkeyPatch()
+    try:
+        test_split_by_words_matches_regex_on_non_ascii()
+        test_split_by_words_paths_agree(monkeypatch)
+    finally:
+        monkeypatch.undo()
+
+
+if __name__ == "__main__":
+    # 手動実行用
+    run_tests()
+    print("すべてのStyledTextテストが完了しました。")
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from src.models.azure.token_observer import TokenRateLimiter
+
+
+def test_wait_for_tokens_admits_waiter_after_completion():
+    """待機中のリクエストがトークン解放後に受け付けられるテスト"""
+
+    async def scenario():
+        limiter = TokenRateLimiter(max_tpm=100)
+        await limiter.on_token_added(90)
+
+        waiter = asyncio.create_task(limiter.wait_for_tokens(50))
+        await asyncio.sleep(0)
+
+        # TPM上限を超えるため待機キューに入っていることを確認
+        assert not waiter.done()
+        assert len(limiter.waiting_tokens) == 1
+
+        # 履歴がウィンドウ外になった状態でトークン完了を通知すると受け付けられる
+        limiter.window_size = 0
+        await limiter.on_token_completed(0)
+        await asyncio.wait_for(waiter, timeout=1)
+
+        assert not limiter.waiting_tokens
+
+    asyncio.run(scenario())
+
+
+def test_wait_for_tokens_times_out():
+    """タイムアウトした待機者にTimeoutErrorが通知されるテスト"""
+
+    async def scenario():
+        limiter = TokenRateLimiter(max_tpm=10)
+        limiter.timeout = 0
+
+        waiter = asyncio.create_task(limiter.wait_for_tokens(100))
+        await asyncio.sleep(0)
+
+        with pytest.raises(TimeoutError):
+            await waiter
+
+        # タイムアウトした待機者は待機キューから取り除かれる
+        assert not limiter.waiting_tokens
+
+    asyncio.run(scenario())
+
+
+def test_waiters_admitted_together_stay_within_tpm():
+    """1回の受け付けで複数の待機者を受け付けてもTPM上限を超えないテスト"""
+
+    async def scenario():
+        limiter = TokenRateLimiter(max_tpm=100)
+        await limiter.on_token_added(100)
+
+        waiters = [
+            asyncio.create_task(limiter.wait_for_tokens(60)),
+            asyncio.create_task(limiter.wait_for_tokens(60)),
+        ]
+        await asyncio.sleep(0)
+
+        # 履歴がウィンドウ外になっても、受け付けられるのは先頭の1件のみ
+        limiter.window_size = 0.05
+        await asyncio.sleep(0.06)
+        await limiter.on_token_completed(100)
+        limiter.window_size = 60
+        await asyncio.sleep(0)
+
+        assert waiters[0].done()
+        assert not waiters[1].done()
+        assert await limiter.get_current_tpm() == 60
+
+        waiters[1].cancel()
+
+    asyncio.run(scenario())
+
+
+def test_waiter_is_admitted_when_window_slides():
+    """トークン完了の通知がなくても、時間経過でTPMが空けば受け付けられるテスト"""
+
+    async def scenario():
+        limiter = TokenRateLimiter(max_tpm=100)
+        limiter.window_size = 0.05
+        await limiter.on_token_added(100)
+
+        await asyncio.wait_for(limiter.wait_for_tokens(50), timeout=1)
+
+        assert limiter.active_tokens == 150
+        assert not limiter.waiting_tokens
+
+    asyncio.run(scenario())
+
+
+# 手動実行用のヘルパー関数
+def run_tests():
+    test_wait_for_tokens_admits_waiter_after_completion()
+    test_wait_for_tokens_times_out()
+    test_waiters_admitted_together_stay_within_tpm()
+    test_waiter_is_admitted_when_window_slides()
+
+
+if __name__ == "__main__":
+    # 手動実行用
+    run_tests()
+    print("すべてのTokenRateLimiterテストが完了しました。")